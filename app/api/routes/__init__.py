@@ -1,12 +1,11 @@
 # app/api/routes/__init__.py
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from app.api.routes import voice, browser, email, workflow
 
 # Create main API router
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
-# Include all sub-routers
-api_router.include_router(voice.router, prefix="/voice", tags=["voice"])
-api_router.include_router(browser.router, prefix="/browser", tags=["browser"])
-api_router.include_router(email.router, prefix="/email", tags=["email"])
-api_router.include_router(workflow.router, prefix="/workflow", tags=["workflow"])
\ No newline at end of file
+# Include all sub-routers (prefixes and tags are set on each router)
+for router in (voice.router, browser.router, email.router, workflow.router):
+    api_router.include_router(router)
\ No newline at end of file
@@ -1,18 +1,28 @@
 # app/api/routes/browser.py
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any, List
 import logging
+from uuid import UUID
+
+from app.core.monitoring import timed_route
 
 # Import browser services (to be implemented)
 from app.services.browser import browser_service
 
-router = APIRouter()
+router = APIRouter(
+    prefix="/browser",
+    tags=["browser"],
+    default_response_class=ORJSONResponse,
+    route_class=timed_route("browser")
+)
 logger = logging.getLogger(__name__)
 
 # Models
 class BrowserSessionRequest(BaseModel):
     """Browser session request model"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     action: str  # 'start', 'navigate', 'click', 'input', 'end', etc.
     url: Optional[str] = None
     selector: Optional[str] = None
@@ -22,6 +32,7 @@ class BrowserSessionRequest(BaseModel):
     
 class BrowserResponse(BaseModel):
     """Response model for browser actions"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     session_id: str
     status: str
     content: Optional[str] = None
@@ -30,6 +41,7 @@ class BrowserResponse(BaseModel):
     
 class LoginRequest(BaseModel):
     """Request model for CRM login"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     username: str
     password: str
     security_answer: Optional[str] = None
@@ -38,64 +50,35 @@ class LoginRequest(BaseModel):
 @router.post("/session", response_model=BrowserResponse)
 async def browser_session(request: BrowserSessionRequest):
     """Manage a browser session"""
-    try:
-        # Will implement actual processing in the service layer
-        logger.info(f"Browser session action: {request.action}")
-        result = await browser_service.manage_session(
-            action=request.action,
-            url=request.url,
-            selector=request.selector,
-            text=request.text,
-            session_id=request.session_id,
-            timeout=request.timeout
-        )
-        return result
-    except Exception as e:
-        logger.error(f"Error in browser session: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error in browser session: {str(e)}"
-        )
+    # Will implement actual processing in the service layer
+    logger.info("Browser session action: %s", request.action)
+    return await browser_service.manage_session(
+        action=request.action,
+        url=request.url,
+        selector=request.selector,
+        text=request.text,
+        session_id=request.session_id,
+        timeout=request.timeout
+    )
 
 @router.post("/login", response_model=BrowserResponse)
 async def login_to_crm(request: LoginRequest):
     """Login to the Slate CRM"""
-    try:
-        result = await browser_service.login_to_crm(
-            username=request.username,
-            password=request.password,
-            security_answer=request.security_answer
-        )
-        return result
-    except Exception as e:
-        logger.error(f"Error logging into CRM: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error logging into CRM: {str(e)}"
-        )
+    return await browser_service.login_to_crm(
+        username=request.username,
+        password=request.password,
+        security_answer=request.security_answer
+    )
 
 @router.post("/navigate/inbox", response_model=BrowserResponse)
 async def navigate_to_inbox(session_id: str):
     """Navigate to the email inbox in Slate CRM"""
-    try:
-        result = await browser_service.navigate_to_inbox(session_id=session_id)
-        return result
-    except Exception as e:
-        logger.error(f"Error navigating to inbox: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error navigating to inbox: {str(e)}"
-        )
+    return await browser_service.navigate_to_inbox(session_id=session_id)
 
 @router.get("/status/{session_id}")
-async def browser_status(session_id: str):
+async def browser_status(session_id: UUID):
     """Check the status of a browser session"""
-    try:
-        status = await browser_service.get_session_status(session_id=session_id)
-        return {"session_id": session_id, "status": status}
-    except Exception as e:
-        logger.error(f"Error checking browser session status: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error checking browser session status: {str(e)}"
-        )
\ No newline at end of file
+    # Sessions are keyed by 32 hex digits, the undashed form of the UUID
+    session_id = session_id.hex
+    status = await browser_service.get_session_status(session_id=session_id)
+    return ORJSONResponse(content={"session_id": session_id, "status": status})
\ No newline at end of file
@@ -1,23 +1,34 @@
 # app/api/routes/email.py
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, Header
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any, List
 import logging
 
+from app.core.monitoring import timed_route
+from app.utils.streaming import NDJSON_MEDIA_TYPE, STREAM_THRESHOLD, stream_json_array, stream_ndjson
+
 # Import our email services (to be implemented)
 from app.services.email import email_service
 
-router = APIRouter()
+router = APIRouter(
+    prefix="/email",
+    tags=["email"],
+    default_response_class=ORJSONResponse,
+    route_class=timed_route("email")
+)
 logger = logging.getLogger(__name__)
 
 # Models
 class EmailRequest(BaseModel):
     """Email processing request model"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     session_id: str
     email_id: Optional[str] = None  # If None, process first email in inbox
     
 class EmailContent(BaseModel):
     """Email content model"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     email_id: str
     subject: str
     sender: str
@@ -26,8 +37,18 @@ class EmailContent(BaseModel):
     body: str
     attachments: Optional[List[str]] = None
     
+class EmailSummary(BaseModel):
+    """Email summary model for inbox listings"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    email_id: str
+    subject: str
+    sender: str
+    date: str
+    read: bool
+    
 class EmailResponse(BaseModel):
     """Response model for email processing"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     email: EmailContent
     suggested_response: str
     intent: str
@@ -35,6 +56,7 @@ class EmailResponse(BaseModel):
     
 class DraftResponse(BaseModel):
     """Request model for submitting a draft response"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     email_id: str
     session_id: str
     response_text: str
@@ -44,50 +66,32 @@ class DraftResponse(BaseModel):
 @router.post("/process", response_model=EmailResponse)
 async def process_email(request: EmailRequest):
     """Process an email and generate a suggested response"""
-    try:
-        logger.info(f"Processing email for session: {request.session_id}")
-        result = await email_service.process_email(
-            session_id=request.session_id,
-            email_id=request.email_id
-        )
-        return result
-    except Exception as e:
-        logger.error(f"Error processing email: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing email: {str(e)}"
-        )
+    logger.info("Processing email for session: %s", request.session_id)
+    return await email_service.process_email(
+        session_id=request.session_id,
+        email_id=request.email_id
+    )
 
 @router.post("/draft", response_model=Dict[str, Any])
 async def submit_email_draft(request: DraftResponse):
     """Submit a draft email response"""
-    try:
-        result = await email_service.submit_draft(
-            email_id=request.email_id,
-            session_id=request.session_id,
-            response_text=request.response_text,
-            send=request.send
-        )
-        return {"status": "success", "result": result}
-    except Exception as e:
-        logger.error(f"Error submitting email draft: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error submitting email draft: {str(e)}"
-        )
+    result = await email_service.submit_draft(
+        email_id=request.email_id,
+        session_id=request.session_id,
+        response_text=request.response_text,
+        send=request.send
+    )
+    return ORJSONResponse(content={"status": "success", "result": result})
 
-@router.get("/list", response_model=List[Dict[str, Any]])
-async def list_emails(session_id: str, limit: int = 10):
+@router.get("/list", response_model=List[EmailSummary])
+async def list_emails(session_id: str, limit: int = 10, accept: Optional[str] = Header(None)):
     """List emails in the inbox"""
-    try:
-        emails = await email_service.list_emails(
-            session_id=session_id,
-            limit=limit
-        )
-        return emails
-    except Exception as e:
-        logger.error(f"Error listing emails: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error listing emails: {str(e)}"
-        )
\ No newline at end of file
+    # Clients asking for NDJSON get one email per line as soon as it is fetched
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return stream_ndjson(email_service.iter_emails(session_id=session_id, limit=limit))
+    if limit > STREAM_THRESHOLD:
+        return stream_json_array(email_service.iter_emails(session_id=session_id, limit=limit))
+    return await email_service.list_emails(
+        session_id=session_id,
+        limit=limit
+    )
\ No newline at end of file
@@ -1,75 +1,77 @@
 # app/api/routes/voice.py
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
-from pydantic import BaseModel
+import binascii
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any, List
 import logging
 
+from app.core.monitoring import timed_route
+
 # Import our voice services (to be implemented)
-from app.services.voice import voice_service
+from app.services.voice import voice_service, iter_base64_chunks
 
-router = APIRouter()
+router = APIRouter(
+    prefix="/voice",
+    tags=["voice"],
+    default_response_class=ORJSONResponse,
+    route_class=timed_route("voice")
+)
 logger = logging.getLogger(__name__)
 
 # Models
 class VoiceCommandRequest(BaseModel):
     """Voice command request model"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     audio_data: str  # Base64 encoded audio data
     sample_rate: int = 16000
     channels: int = 1
     
 class CommandResponse(BaseModel):
     """Response model for voice commands"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     command: str
     confidence: float
     action: str
     status: str
     message: Optional[str] = None
 
+def _invalid_audio() -> HTTPException:
+    """Error for audio_data that isn't valid Base64 (or isn't ASCII), which is the client's fault"""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="audio_data is not valid Base64"
+    )
+
 # Routes
 @router.post("/process", response_model=CommandResponse)
 async def process_voice_command(request: VoiceCommandRequest):
     """Process a voice command from audio data"""
+    # Will implement actual processing in the service layer
+    logger.info("Processing voice command")
     try:
-        # Will implement actual processing in the service layer
-        logger.info("Processing voice command")
-        result = await voice_service.process_command(
-            audio_data=request.audio_data,
+        return await voice_service.process_command(
+            audio_stream=iter_base64_chunks(request.audio_data),
             sample_rate=request.sample_rate,
             channels=request.channels
         )
-        return result
-    except Exception as e:
-        logger.error(f"Error processing voice command: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing voice command: {str(e)}"
-        )
+    except (binascii.Error, UnicodeEncodeError):
+        raise _invalid_audio()
 
 @router.get("/status")
 async def voice_service_status():
     """Check the status of the voice service"""
-    try:
-        status = await voice_service.get_status()
-        return {"status": status}
-    except Exception as e:
-        logger.error(f"Error checking voice service status: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error checking voice service status: {str(e)}"
-        )
+    status = await voice_service.get_status()
+    return ORJSONResponse(content={"status": status})
 
 @router.post("/wake-word/detect")
 async def detect_wake_word(request: VoiceCommandRequest):
     """Detect wake word in audio stream"""
     try:
         result = await voice_service.detect_wake_word(
-            audio_data=request.audio_data,
+            audio_stream=iter_base64_chunks(request.audio_data),
             sample_rate=request.sample_rate
         )
-        return {"detected": result.detected, "confidence": result.confidence}
-    except Exception as e:
-        logger.error(f"Error detecting wake word: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error detecting wake word: {str(e)}"
-        )
\ No newline at end of file
+    except (binascii.Error, UnicodeEncodeError):
+        raise _invalid_audio()
+    return ORJSONResponse(content={"detected": result.detected, "confidence": result.confidence})
\ No newline at end of file
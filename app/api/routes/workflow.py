@@ -1,23 +1,71 @@
 # app/api/routes/workflow.py
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from fastapi import APIRouter, HTTPException, status, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Dict, Any, List, Set
+import asyncio
 import logging
+from uuid import UUID
+
+import orjson
+
+from app.core.monitoring import timed_route
+from app.utils.streaming import STREAM_THRESHOLD, stream_json_array
 
 # Import our workflow controller
-from app.core.workflow_controller import workflow_controller, WorkflowState
+from app.core.workflow_controller import workflow_controller, WorkflowEvent, WorkflowState
 
-router = APIRouter()
+router = APIRouter(
+    prefix="/workflow",
+    tags=["workflow"],
+    default_response_class=ORJSONResponse,
+    route_class=timed_route("workflow")
+)
 logger = logging.getLogger(__name__)
 
+# Updates a slow WebSocket client may fall behind by before new ones are dropped
+SESSION_UPDATE_QUEUE_SIZE = 16
+
+# Outgoing message queues of the WebSocket clients watching each session
+_session_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+def _push_session_update(event: WorkflowEvent):
+    """Send a session's new summary to its WebSocket subscribers, serialized once for all"""
+    queues = _session_subscribers.get(event.session_id)
+    if not queues:
+        return
+    
+    session = workflow_controller.get_session(event.session_id)
+    if session is None:
+        return
+    
+    message = orjson.dumps(session).decode()
+    for queue in queues:
+        if event.state == WorkflowState.IDLE:
+            # The session has ended: its summary replaces any pending ones and
+            # is followed by the sentinel that closes the socket
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(message)
+            queue.put_nowait(None)
+            continue
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.debug("Session update queue full, dropping update for %s", event.session_id)
+
+workflow_controller.register_event_listener(_push_session_update)
+
 # Models
 class CommandRequest(BaseModel):
     """Request model for voice commands"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     command: str
     session_id: Optional[str] = None
 
 class SessionResponse(BaseModel):
     """Response model for workflow sessions"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
     session_id: str
     current_state: WorkflowState
     browser_session_id: Optional[str] = None
@@ -25,80 +73,93 @@ class SessionResponse(BaseModel):
     has_draft: bool
     start_time: str
     events: int
+    last_state: Optional[WorkflowState] = None
+    last_message: Optional[str] = None
+    last_event: Optional[Dict[str, Any]] = None  # Only with include_event=true
 
 # Routes
 @router.post("/command", response_model=Dict[str, Any])
 async def process_command(request: CommandRequest):
     """Process a voice command"""
-    try:
-        if request.session_id:
-            # TODO: Implement command processing for specific session
-            # For now, we'll just use the active session
-            pass
-        
-        result = await workflow_controller.process_voice_command(request.command)
-        return result
-    except Exception as e:
-        logger.error(f"Error processing command: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing command: {str(e)}"
-        )
+    if request.session_id:
+        # TODO: Implement command processing for specific session
+        # For now, we'll just use the active session
+        pass
+    
+    return await workflow_controller.process_voice_command(request.command)
 
 @router.post("/session", response_model=Dict[str, Any])
 async def create_session():
     """Create a new workflow session"""
-    try:
-        result = await workflow_controller.create_session()
-        return result
-    except Exception as e:
-        logger.error(f"Error creating session: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error creating session: {str(e)}"
-        )
+    return await workflow_controller.create_session()
 
 @router.delete("/session/{session_id}", response_model=Dict[str, Any])
-async def end_session(session_id: str):
+async def end_session(session_id: UUID):
     """End a workflow session"""
-    try:
-        result = await workflow_controller.end_session(session_id)
-        return result
-    except Exception as e:
-        logger.error(f"Error ending session: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error ending session: {str(e)}"
-        )
+    return await workflow_controller.end_session(session_id.hex)
 
-@router.get("/sessions", response_model=List[Dict[str, Any]])
-async def get_all_sessions():
+@router.get("/sessions", response_model=List[SessionResponse])
+async def get_all_sessions(include_event: bool = False):
     """Get all active workflow sessions"""
-    try:
-        return await workflow_controller.get_all_sessions()
-    except Exception as e:
-        logger.error(f"Error getting sessions: {str(e)}")
+    if len(workflow_controller.sessions) > STREAM_THRESHOLD:
+        return stream_json_array(workflow_controller.iter_sessions(include_event))
+    return ORJSONResponse(content=workflow_controller.get_all_sessions(include_event))
+
+@router.get("/session/{session_id}", response_model=SessionResponse)
+async def get_session(session_id: UUID, include_event: bool = False):
+    """Get information about a specific workflow session"""
+    session = workflow_controller.get_session(session_id.hex, include_event)
+    if not session:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error getting sessions: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found"
         )
+    return session
 
-@router.get("/session/{session_id}", response_model=Dict[str, Any])
-async def get_session(session_id: str):
-    """Get information about a specific workflow session"""
+@router.websocket("/ws/session/{session_id}")
+async def session_updates(websocket: WebSocket, session_id: UUID):
+    """Push a session's summary to the client on every state change"""
+    session_id = session_id.hex
+    await websocket.accept()
+    
+    session = workflow_controller.get_session(session_id)
+    if session is None:
+        await websocket.close(code=4404, reason="Session not found")
+        return
+    
+    queue = asyncio.Queue(maxsize=SESSION_UPDATE_QUEUE_SIZE)
+    _session_subscribers.setdefault(session_id, set()).add(queue)
+    
+    async def forward():
+        while True:
+            message = await queue.get()
+            if message is None:
+                await websocket.close(code=status.WS_1000_NORMAL_CLOSURE, reason="Session ended")
+                return
+            await websocket.send_text(message)
+    
+    async def drain():
+        # Nothing is expected from the client; this only returns by disconnecting
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+    
+    await websocket.send_text(orjson.dumps(session).decode())
+    sender = asyncio.create_task(forward())
+    receiver = asyncio.create_task(drain())
     try:
-        session = await workflow_controller.get_session(session_id)
-        if not session:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Session {session_id} not found"
-            )
-        return session
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting session: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error getting session: {str(e)}"
-        )
\ No newline at end of file
+        done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if task.exception() is not None:
+                logger.warning("Session update socket for %s failed: %s", session_id, task.exception())
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        subscribers = _session_subscribers[session_id]
+        subscribers.discard(queue)
+        if not subscribers:
+            del _session_subscribers[session_id]
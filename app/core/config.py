@@ -1,50 +1,58 @@
 # app/core/config.py
-import os
-from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
-from typing import List, Optional
-
-# Load environment variables
-load_dotenv()
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import FrozenSet, List, Optional
 
 class Settings(BaseSettings):
     """Application settings configuration"""
     
+    # Values are read from the environment and the .env file
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore"
+    )
+    
     # API Settings
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "IIT Chicago AI Enrollment Assistant"
     
-    # CORS Settings
-    BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:8000", "http://localhost:3000"]
+    # CORS Settings (a frozenset so the middleware's origin check is a hash lookup)
+    BACKEND_CORS_ORIGINS: FrozenSet[str] = frozenset({"http://localhost:8000", "http://localhost:3000"})
     
     # Authentication
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "development_secret_key")
+    SECRET_KEY: str = "development_secret_key"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
     # CRM Settings
-    SLATE_URL: str = os.getenv("SLATE_URL", "https://apply.illinoistech.edu/manage/inbox/")
-    SLATE_USERNAME: str = os.getenv("SLATE_USERNAME", "")
-    SLATE_PASSWORD: str = os.getenv("SLATE_PASSWORD", "")
+    SLATE_URL: str = "https://apply.illinoistech.edu/manage/inbox/"
+    SLATE_USERNAME: str = ""
+    SLATE_PASSWORD: str = ""
     
     # Voice Settings
     WAKE_WORD: str = "Hey Claude"
     VOICE_ENABLED: bool = True
+    WAKE_WORD_MODEL_PATH: Optional[str] = None  # int8-quantized ONNX model
     
     # Browser Automation
     BROWSER_HEADLESS: bool = False  # Set to True in production
     BROWSER_TYPE: str = "chromium"  # chromium, firefox, webkit
     
     # Logging
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: str = "INFO"
     
     # OpenAI Settings
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4o")
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    OPENAI_API_KEY: str = ""
+    LLM_MODEL: str = "gpt-4o"
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, constructing them on first use"""
+    return Settings()
 
-# Initialize settings
-settings = Settings()
\ No newline at end of file
+def __getattr__(name: str):
+    """Resolve `settings` lazily so importing this module stays cheap"""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
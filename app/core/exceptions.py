@@ -0,0 +1,11 @@
+# app/core/exceptions.py
+from fastapi import status
+
+
+class ServiceError(Exception):
+    """Error raised when a service call behind an API route fails"""
+    
+    def __init__(self, detail: str, status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
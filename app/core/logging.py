@@ -1,13 +1,24 @@
 # app/core/logging.py
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import os
 from datetime import datetime
 from pathlib import Path
-from app.core.config import settings
+from app.core.config import get_settings
+
+# Set once logging is configured so repeated calls don't add handlers or open files
+_INITIALIZED = False
 
 def setup_logging():
-    """Configure logging for the application"""
+    """Configure logging for the application (only the first call has any effect)"""
+    global _INITIALIZED
+    if _INITIALIZED:
+        return logging.getLogger()
+    _INITIALIZED = True
+    
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
@@ -16,8 +27,13 @@ def setup_logging():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = log_dir / f"app_{timestamp}.log"
     
+    # Skip per-record thread/process lookups; these fields are not in our formats
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Configure root logger
-    log_level = getattr(logging, settings.LOG_LEVEL.upper())
+    log_level = getattr(logging, get_settings().LOG_LEVEL.upper())
     
     # Create formatters and handlers
     console_formatter = logging.Formatter(
@@ -32,16 +48,25 @@ def setup_logging():
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(log_level)
     
-    # File handler
-    file_handler = logging.FileHandler(log_file)
+    # File handler, driven by a background listener thread so that disk
+    # writes never block the event loop; the file is only opened on the first write
+    file_handler = logging.FileHandler(log_file, delay=True)
     file_handler.setFormatter(file_formatter)
     file_handler.setLevel(log_level)
     
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    
     # Get root logger and configure
     logger = logging.getLogger()
     logger.setLevel(log_level)
     logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(queue_handler)
     
     # Return logger for use
     return logger
\ No newline at end of file
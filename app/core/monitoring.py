@@ -1,13 +1,34 @@
 # app/core/monitoring.py
 import logging
 import asyncio
+import heapq
+import math
 import time
-from typing import Dict, Any, List, Optional
+from collections import deque
+from enum import IntEnum
+from typing import Dict, Any, Callable, Coroutine, Deque, List, Optional, Tuple, Type
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+import orjson
+from fastapi import Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException
+
+from app.core.exceptions import ServiceError
 
 logger = logging.getLogger(__name__)
 
+class ServiceIndex(IntEnum):
+    """Slots of the core services in ServiceMonitor's metrics tuple"""
+    VOICE = 0
+    BROWSER = 1
+    EMAIL = 2
+    WORKFLOW = 3
+
+# Service name -> slot, used by the name-keyed API
+SERVICE_INDEX: Dict[str, ServiceIndex] = {index.name.lower(): index for index in ServiceIndex}
+
 @dataclass
 class ServiceMetrics:
     """Data class for service metrics"""
@@ -16,30 +37,61 @@ class ServiceMetrics:
     requests_total: int = 0
     requests_success: int = 0
     requests_error: int = 0
-    response_times: List[float] = field(default_factory=list)
+    # Ring buffer of the last 100 response times plus their running sum
+    response_times: Deque[float] = field(default_factory=lambda: deque(maxlen=100))
+    response_time_sum: float = 0.0
     last_error: Optional[str] = None
-    last_error_time: Optional[datetime] = None
+    last_error_time_ns: Optional[int] = None
+    
+    def __post_init__(self):
+        """Capture the monotonic counter matching start_time"""
+        self._start_ns = time.monotonic_ns()
+        self._start_time_iso = self.start_time.isoformat()
+        
+        # Bumped on every recorded request; to_dict reuses its counters
+        # section until this moves on
+        self._version = 0
+        self._counters_version = -1
+        self._counters: Dict[str, Any] = {}
     
     @property
     def uptime_seconds(self) -> float:
         """Get uptime in seconds"""
-        return (datetime.now() - self.start_time).total_seconds()
+        return (time.monotonic_ns() - self._start_ns) / 1e9
+    
+    @property
+    def last_error_time(self) -> Optional[datetime]:
+        """Get the time of the last error as a datetime"""
+        if self.last_error_time_ns is None:
+            return None
+        elapsed_us = (self.last_error_time_ns - self._start_ns) // 1000
+        return self.start_time + timedelta(microseconds=elapsed_us)
     
     @property
     def uptime_formatted(self) -> str:
         """Get formatted uptime string"""
-        seconds = self.uptime_seconds
-        days, seconds = divmod(seconds, 86400)
-        hours, seconds = divmod(seconds, 3600)
-        minutes, seconds = divmod(seconds, 60)
-        return f"{int(days)}d {int(hours)}h {int(minutes)}m {int(seconds)}s"
+        total = (time.monotonic_ns() - self._start_ns) // 1_000_000_000
+        days, rem = divmod(total, 86400)
+        hours, rem = divmod(rem, 3600)
+        minutes, seconds = divmod(rem, 60)
+        return f"{days}d {hours}h {minutes}m {seconds}s"
     
     @property
     def avg_response_time(self) -> Optional[float]:
         """Get average response time"""
         if not self.response_times:
             return None
-        return sum(self.response_times) / len(self.response_times)
+        return self.response_time_sum / len(self.response_times)
+    
+    @property
+    def p95_response_time(self) -> Optional[float]:
+        """Get the 95th percentile response time (nearest rank)"""
+        if not self.response_times:
+            return None
+        # Only the top 5% of samples are needed, so avoid sorting the whole buffer
+        n = len(self.response_times)
+        k = n - math.ceil(0.95 * n) + 1
+        return heapq.nlargest(k, self.response_times)[-1]
     
     @property
     def success_rate(self) -> Optional[float]:
@@ -50,6 +102,7 @@ class ServiceMetrics:
     
     def record_request(self, success: bool, response_time: float, error: Optional[str] = None):
         """Record a request"""
+        self._version += 1
         self.requests_total += 1
         
         if success:
@@ -57,42 +110,70 @@ class ServiceMetrics:
         else:
             self.requests_error += 1
             self.last_error = error
-            self.last_error_time = datetime.now()
+            self.last_error_time_ns = time.monotonic_ns()
         
-        # Keep last 100 response times for average calculation
+        # Keep last 100 response times for average calculation; the deque
+        # drops the oldest sample itself, so only the running sum needs fixing
+        if len(self.response_times) == self.response_times.maxlen:
+            self.response_time_sum -= self.response_times[0]
         self.response_times.append(response_time)
-        if len(self.response_times) > 100:
-            self.response_times.pop(0)
+        self.response_time_sum += response_time
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
+    def _build_counters(self) -> Dict[str, Any]:
+        """Build the to_dict sections that only change when a request is recorded"""
+        success_rate = self.success_rate
+        avg_response_time = self.avg_response_time
+        p95_response_time = self.p95_response_time
+        last_error_time = self.last_error_time
         return {
-            "service_name": self.service_name,
-            "start_time": self.start_time.isoformat(),
-            "uptime": self.uptime_formatted,
             "requests": {
                 "total": self.requests_total,
                 "success": self.requests_success,
                 "error": self.requests_error,
-                "success_rate": f"{self.success_rate:.2f}%" if self.success_rate is not None else "N/A"
+                "success_rate": f"{success_rate:.2f}%" if success_rate is not None else "N/A"
             },
             "response_time": {
-                "average": f"{self.avg_response_time:.2f}ms" if self.avg_response_time is not None else "N/A",
+                "average": f"{avg_response_time:.2f}ms" if avg_response_time is not None else "N/A",
+                "p95": f"{p95_response_time:.2f}ms" if p95_response_time is not None else "N/A",
                 "samples": len(self.response_times)
             },
             "last_error": {
                 "message": self.last_error,
-                "time": self.last_error_time.isoformat() if self.last_error_time else None
+                "time": last_error_time.isoformat() if last_error_time else None
             }
         }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        if self._counters_version != self._version:
+            self._counters = self._build_counters()
+            self._counters_version = self._version
+        
+        # The sections hold only scalars, so copying each one keeps callers from
+        # modifying the cached counters
+        return {
+            "service_name": self.service_name,
+            "start_time": self._start_time_iso,
+            "uptime": self.uptime_formatted,
+            **{name: dict(section) for name, section in self._counters.items()}
+        }
 
 class ServiceMonitor:
     """Service monitoring utility"""
     
     def __init__(self):
         """Initialize the service monitor"""
-        self.services: Dict[str, ServiceMetrics] = {}
+        # Core services live in a fixed tuple indexed by ServiceIndex; the
+        # name-keyed dict also holds any services registered later on
+        self._metrics: Tuple[ServiceMetrics, ...] = tuple(
+            ServiceMetrics(service_name=index.name.lower()) for index in ServiceIndex
+        )
+        self.services: Dict[str, ServiceMetrics] = {m.service_name: m for m in self._metrics}
         self.start_time = datetime.now()
+        
+        # Serialized metrics payload and the monotonic time it was built at
+        self._metrics_json: Optional[bytes] = None
+        self._metrics_json_time = 0.0
     
     def register_service(self, service_name: str) -> ServiceMetrics:
         """Register a service for monitoring"""
@@ -115,6 +196,20 @@ class ServiceMonitor:
             for service_name, metrics in self.services.items()
         }
     
+    def get_metrics_json(self, max_age_seconds: float = 60.0) -> bytes:
+        """Get system and service metrics as JSON, rebuilt at most once per max_age_seconds"""
+        now = time.monotonic()
+        if self._metrics_json is None or now - self._metrics_json_time >= max_age_seconds:
+            self._metrics_json = orjson.dumps(
+                {
+                    "system": self.get_system_metrics(),
+                    "services": self.get_all_metrics()
+                },
+                option=orjson.OPT_NAIVE_UTC
+            )
+            self._metrics_json_time = now
+        return self._metrics_json
+    
     def record_request(
         self, 
         service_name: str, 
@@ -123,6 +218,11 @@ class ServiceMonitor:
         error: Optional[str] = None
     ):
         """Record a request for a service"""
+        index = SERVICE_INDEX.get(service_name)
+        if index is not None:
+            self._metrics[index].record_request(success, response_time, error)
+            return
+        
         if service_name not in self.services:
             logger.warning(f"Service {service_name} not registered, registering now")
             self.register_service(service_name)
@@ -133,6 +233,16 @@ class ServiceMonitor:
             error=error
         )
     
+    def record_indexed(
+        self,
+        index: ServiceIndex,
+        success: bool,
+        response_time: float,
+        error: Optional[str] = None
+    ):
+        """Record a request for a core service by its slot"""
+        self._metrics[index].record_request(success, response_time, error)
+    
     async def monitor_task(self, interval_seconds: int = 300):
         """Background task to log periodic service status"""
         logger.info("Starting service monitoring task")
@@ -142,14 +252,21 @@ class ServiceMonitor:
                 # Wait for the specified interval
                 await asyncio.sleep(interval_seconds)
                 
+                if not logger.isEnabledFor(logging.INFO):
+                    continue
+                
                 # Log status for each service
                 for service_name, metrics in self.services.items():
+                    success_rate = metrics.success_rate
+                    avg_response_time = metrics.avg_response_time
                     logger.info(
-                    f"Service {service_name}: "
-                    f"Uptime {metrics.uptime_formatted}, "
-                    f"Requests {metrics.requests_total}, "
-                    f"Success rate {metrics.success_rate:.2f}% if metrics.success_rate is not None else 'N/A', "
-                    f"Avg response time {metrics.avg_response_time:.2f}ms if metrics.avg_response_time is not None else 'N/A'")
+                        "Service %s: Uptime %s, Requests %d, Success rate %s, Avg response time %s",
+                        service_name,
+                        metrics.uptime_formatted,
+                        metrics.requests_total,
+                        f"{success_rate:.2f}%" if success_rate is not None else "N/A",
+                        f"{avg_response_time:.2f}ms" if avg_response_time is not None else "N/A"
+                    )
             except Exception as e:
                 logger.error(f"Error in monitoring task: {str(e)}")
     
@@ -164,39 +281,55 @@ class ServiceMonitor:
             "total_requests": sum(s.requests_total for s in self.services.values())
         }
 
-# Initialize service monitor
+# Initialize service monitor (core services are registered on construction)
 service_monitor = ServiceMonitor()
 
-# Register core services
-service_monitor.register_service("voice")
-service_monitor.register_service("browser")
-service_monitor.register_service("email")
-service_monitor.register_service("workflow")
-
 # Decorator for monitoring service functions
-def monitor_service(service_name: str):
-    """Decorator to monitor service function execution"""
-    def decorator(func):
-        async def wrapper(*args, **kwargs):
-            start_time = time.time()
-            success = False
-            error = None
+def timed_route(service_name: str) -> Type[APIRoute]:
+    """Build an APIRoute class that records handler timing for a service
+    
+    Unexpected exceptions are recorded as failures and re-raised as ServiceError,
+    which the app's exception handler logs once and turns into a 500 response.
+    """
+    # Resolve the slot once when the router is built rather than on every call
+    index = SERVICE_INDEX.get(service_name)
+    
+    class TimedRoute(APIRoute):
+        def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+            handler = super().get_route_handler()
             
-            try:
-                result = await func(*args, **kwargs)
-                success = True
-                return result
-            except Exception as e:
-                error = str(e)
-                raise
-            finally:
-                response_time = (time.time() - start_time) * 1000  # Convert to ms
-                service_monitor.record_request(
-                    service_name=service_name,
-                    success=success,
-                    response_time=response_time,
-                    error=error
-                )
-        
-        return wrapper
-    return decorator
\ No newline at end of file
+            async def timed_handler(request: Request) -> Response:
+                start = time.perf_counter_ns()
+                success = False
+                error = None
+                
+                try:
+                    response = await handler(request)
+                    success = response.status_code < 500
+                    return response
+                except HTTPException as e:
+                    success = e.status_code < 500
+                    raise
+                except RequestValidationError:
+                    # Bad input is the client's fault, not the service's
+                    success = True
+                    raise
+                except Exception as e:
+                    error = str(e)
+                    raise ServiceError(error) from e
+                finally:
+                    response_time = (time.perf_counter_ns() - start) / 1_000_000.0  # Convert to ms
+                    if index is not None:
+                        service_monitor.record_indexed(index, success, response_time, error)
+                    else:
+                        service_monitor.record_request(
+                            service_name=service_name,
+                            success=success,
+                            response_time=response_time,
+                            error=error
+                        )
+            
+            return timed_handler
+    
+    TimedRoute.__name__ = f"{service_name.title()}TimedRoute"
+    return TimedRoute
@@ -1,12 +1,19 @@
 # app/core/workflow_controller.py
 import logging
 import asyncio
+import itertools
 import os
-from typing import Dict, Any, Optional, List, Callable
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, List, Callable, AsyncIterator, Deque, Iterable
 from enum import Enum
-from dataclasses import dataclass
-from datetime import datetime
-from pydantic import BaseModel
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import aiohttp
 
 # Import our services
 from app.services.browser import browser_service
@@ -17,6 +24,9 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+def _log_noop(*args, **kwargs):
+    """Stand-in for a logger method whose level is disabled"""
+
 class WorkflowState(str, Enum):
     """Enum representing the current state of the workflow"""
     IDLE = "idle"
@@ -30,61 +40,307 @@ class WorkflowState(str, Enum):
     SUBMITTING = "submitting"
     ERROR = "error"
 
-class WorkflowEvent(BaseModel):
-    """Model for workflow events"""
+# States in which a session is no longer active
+_TERMINAL_STATES = frozenset({WorkflowState.IDLE})
+
+# Allowed state changes; staying in the same state is always allowed. Any
+# state can fail into ERROR or be ended (IDLE).
+_VALID_TRANSITIONS: Dict[WorkflowState, frozenset] = {
+    state: frozenset(targets) | {WorkflowState.ERROR, WorkflowState.IDLE}
+    for state, targets in {
+        WorkflowState.IDLE: {WorkflowState.LISTENING},
+        WorkflowState.LISTENING: {WorkflowState.PROCESSING_COMMAND},
+        WorkflowState.PROCESSING_COMMAND: {
+            WorkflowState.AUTHENTICATING,
+            WorkflowState.NAVIGATING,
+            WorkflowState.READING_EMAIL,
+            WorkflowState.GENERATING_RESPONSE,
+            WorkflowState.SUBMITTING,
+        },
+        WorkflowState.AUTHENTICATING: {WorkflowState.LISTENING},
+        WorkflowState.NAVIGATING: {WorkflowState.LISTENING},
+        WorkflowState.READING_EMAIL: {WorkflowState.LISTENING},
+        WorkflowState.GENERATING_RESPONSE: {WorkflowState.REVIEWING},
+        WorkflowState.REVIEWING: {WorkflowState.PROCESSING_COMMAND},
+        WorkflowState.SUBMITTING: {WorkflowState.LISTENING},
+        WorkflowState.ERROR: {WorkflowState.PROCESSING_COMMAND, WorkflowState.LISTENING},
+    }.items()
+}
+
+# States a session can wait in between commands, and so be resumed into
+_RESTING_STATES = frozenset({WorkflowState.LISTENING, WorkflowState.REVIEWING, WorkflowState.ERROR})
+
+# Number of recent events kept per session
+MAX_SESSION_EVENTS = 64
+
+# Soft cap on open sessions; creating one past it ends the least recently active
+MAX_SESSIONS = 256
+
+# Async listener delivery: pending events are capped and handled by a few workers
+EVENT_QUEUE_SIZE = 256
+LISTENER_WORKERS = 4
+
+# Events collected for the batch listeners while inside WorkflowController.buffered()
+_event_buffer: ContextVar[Optional[List["WorkflowEvent"]]] = ContextVar("workflow_event_buffer", default=None)
+
+# Wall-clock time paired with the monotonic counter, for turning event times into datetimes
+_CLOCK_ANCHOR = datetime.now()
+_CLOCK_ANCHOR_NS = time.monotonic_ns()
+
+@dataclass(slots=True, frozen=True)
+class WorkflowEvent:
+    """Data class for workflow events (only ever built internally, so not validated)"""
     state: WorkflowState
-    timestamp: datetime = datetime.now()
+    timestamp_ns: int = field(default_factory=time.monotonic_ns)
     data: Optional[Dict[str, Any]] = None
     message: Optional[str] = None
+    session_id: Optional[str] = None  # Lets listeners route the event; not part of to_dict()
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Get the time of the event as a datetime"""
+        elapsed_us = (self.timestamp_ns - _CLOCK_ANCHOR_NS) // 1000
+        return _CLOCK_ANCHOR + timedelta(microseconds=elapsed_us)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the event to a dictionary"""
+        return {
+            "state": self.state,
+            "timestamp": self.timestamp,
+            "data": self.data,
+            "message": self.message
+        }
+
+# Command vocabulary, compiled into a single regex. Every alternative is a
+# lookahead from the start of the command, so alternatives are tried in order and
+# the first rule that matches anywhere wins (a plain alternation would pick the
+# leftmost keyword instead). Patterns only anchor the start of a word so that
+# e.g. "messages" and "response" still match.
+_COMMAND_RE = re.compile(
+    r"^(?:"
+    r"(?=.*?(?P<login>\blog\s?in))"
+    r"|(?=.*?(?P<inbox>\b(?:inbox|emails)))"
+    r"|(?P<read>(?=.*?\bread)(?=.*?\b(?:email|message)))"
+    r"|(?=.*?(?P<generate>\b(?:generate|respond|reply)))"
+    r"|(?=.*?(?P<submit>\b(?:submit|send)))"
+    r"|(?P<draft>(?=.*?\bsave)(?=.*?\bdraft))"
+    r")",
+    re.I | re.S
+)
+
+# Matched group -> (handler name, keyword arguments). Handlers are looked up on
+# the controller at dispatch time.
+_COMMAND_HANDLERS = {
+    "login": ("_handle_login_command", {}),
+    "inbox": ("_handle_inbox_command", {}),
+    "read": ("_handle_read_email_command", {}),
+    "generate": ("_handle_generate_response_command", {}),
+    "submit": ("_handle_submit_response_command", {"send": True}),
+    "draft": ("_handle_submit_response_command", {"send": False}),
+}
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowSession:
-    """Data class for a workflow session"""
+    """Data class for a workflow session
+    
+    event_count doubles as the version of the session's public summary, so fields
+    must be changed before the add_event that reports the change.
+    """
     session_id: str
     browser_session_id: Optional[str] = None
     current_email_id: Optional[str] = None
     current_state: WorkflowState = WorkflowState.IDLE
     draft_response: Optional[str] = None
-    start_time: datetime = datetime.now()
-    events: List[WorkflowEvent] = None
+    start_time: datetime = field(default_factory=datetime.now)
+    start_ns: int = field(default_factory=time.monotonic_ns)  # For cheap recency ordering
+    # Only the most recent events are kept; event_count tracks the full total
+    events: Deque[WorkflowEvent] = field(default_factory=lambda: deque(maxlen=MAX_SESSION_EVENTS))
+    event_count: int = 0
+    # Called with the session and each new event, after the state has changed
+    on_event: Optional[Callable[["WorkflowSession", WorkflowEvent], None]] = field(
+        default=None, repr=False, compare=False
+    )
+    # start_time never changes, so its ISO form is built once
+    start_time_iso: str = field(init=False, repr=False, compare=False)
+    # Summary built by WorkflowController._session_dict, valid while event_count matches
+    summary: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    summary_version: int = field(default=-1, init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        """Initialize events list if None"""
-        if self.events is None:
-            self.events = []
+        """Cache the ISO-formatted start time"""
+        self.start_time_iso = self.start_time.isoformat()
+    
+    def can_transition(self, state: WorkflowState) -> bool:
+        """Check whether the session may move to the given state"""
+        return state == self.current_state or state in _VALID_TRANSITIONS[self.current_state]
     
     def add_event(self, state: WorkflowState, data: Optional[Dict[str, Any]] = None, message: Optional[str] = None):
-        """Add an event to the session history"""
-        event = WorkflowEvent(state=state, data=data, message=message)
+        """Add an event to the session history and report it to on_event"""
+        if not self.can_transition(state):
+            raise ValueError(f"Invalid workflow transition: {self.current_state.value} -> {state.value}")
+        
+        event = WorkflowEvent(state=state, data=data, message=message, session_id=self.session_id)
         self.events.append(event)
+        self.event_count += 1
         self.current_state = state
+        if self.on_event is not None:
+            self.on_event(self, event)
         return event
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Capture the state needed to resume this session without its event history"""
+        return {
+            "session_id": self.session_id,
+            "browser_session_id": self.browser_session_id,
+            "current_email_id": self.current_email_id,
+            "current_state": self.current_state.value,
+            "draft_response": self.draft_response,
+            "start_time": self.start_time_iso,
+            "event_count": self.event_count
+        }
+    
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot: Dict[str, Any],
+        on_event: Optional[Callable[["WorkflowSession", WorkflowEvent], None]] = None
+    ) -> "WorkflowSession":
+        """Rebuild a session from a snapshot; a mid-command state resumes as LISTENING"""
+        state = WorkflowState(snapshot["current_state"])
+        return cls(
+            session_id=snapshot["session_id"],
+            browser_session_id=snapshot.get("browser_session_id"),
+            current_email_id=snapshot.get("current_email_id"),
+            current_state=state if state in _RESTING_STATES else WorkflowState.LISTENING,
+            draft_response=snapshot.get("draft_response"),
+            start_time=datetime.fromisoformat(snapshot["start_time"]),
+            event_count=snapshot.get("event_count", 0),
+            on_event=on_event
+        )
 
 class WorkflowController:
     """Controller for orchestrating the entire email processing workflow"""
     
     def __init__(self):
         """Initialize the workflow controller"""
-        self.sessions = {}  # Dict of active sessions
+        # Active sessions, least recently active first
+        self.sessions: "OrderedDict[str, WorkflowSession]" = OrderedDict()
+        # Session ids are a random prefix plus a counter, 32 hex digits like the UUIDs
+        # the routes accept, without an os.urandom call per session. initialize() draws
+        # a new prefix, so each worker process (forked after the app was imported) and
+        # each restart (resumed sessions keep their old ids) gets its own
+        self._session_id_prefix = os.urandom(8).hex()
+        self._session_counter = itertools.count(1)
+        # Bumped whenever any session changes, appears or goes; versions _all_sessions_cache
+        self._sessions_version = 0
+        self._all_sessions_cache: Optional[List[Dict[str, Any]]] = None
+        self._all_sessions_cache_version = -1
+        self._mru_active_session_id: Optional[str] = None  # Most recently active non-idle session
         self.voice_activator = None
+        self.http_session: Optional[aiohttp.ClientSession] = None  # Shared by the services
         self.event_listeners = []  # Callbacks for state changes
+        # The same callbacks split by kind and bucketed by the states they want, once at registration.
+        # Buckets are tuples replaced whole under the lock, so notifying iterates a snapshot lock-free
+        self._sync_listeners: Dict[WorkflowState, tuple] = {state: () for state in WorkflowState}
+        self._async_listeners: Dict[WorkflowState, tuple] = {state: () for state in WorkflowState}
+        self._batch_listeners: tuple = ()  # Called with a list of events, see buffered()
+        self._listeners_lock = threading.Lock()
+        # Events waiting for the async listeners, drained by worker tasks once initialized
+        self._event_queue: Optional[asyncio.Queue] = None
+        self._listener_workers: List[asyncio.Task] = []
+        self._pending_deliveries = set()  # Keeps uninitialized-delivery tasks referenced
+        self._bind_loggers()
+    
+    def _bind_loggers(self):
+        """Cache logger methods, swapping disabled levels for a no-op
+        
+        Call again whenever the logging configuration changes.
+        """
+        self._log_info = logger.info if logger.isEnabledFor(logging.INFO) else _log_noop
+        self._log_warn = logger.warning if logger.isEnabledFor(logging.WARNING) else _log_noop
+        self._log_err = logger.error if logger.isEnabledFor(logging.ERROR) else _log_noop
     
     async def initialize(self):
         """Initialize the workflow controller"""
-        logger.info("Initializing workflow controller")
+        # Logging is configured by the time the app starts up, so rebind here
+        self._bind_loggers()
+        self._log_info("Initializing workflow controller")
+        
+        # Runs in each worker's startup, after any fork, unlike __init__
+        self._session_id_prefix = os.urandom(8).hex()
+        
+        # One pooled HTTP session for the services so connections are kept alive and reused
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=50,
+                    limit_per_host=10,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75
+                )
+            )
+            browser_service.set_session(self.http_session)
+            email_service.set_session(self.http_session)
+        
+        if not self._listener_workers:
+            self._event_queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+            self._listener_workers = [
+                asyncio.create_task(self._listener_worker()) for _ in range(LISTENER_WORKERS)
+            ]
         
         # Initialize voice activation with a callback to our command handler
         self.voice_activator = await initialize_voice_activator(
             wake_word=settings.WAKE_WORD,
-            callback=self._handle_voice_event
+            callback=self._handle_voice_event,
+            model_path=settings.WAKE_WORD_MODEL_PATH
         )
         
-        logger.info("Workflow controller initialized successfully")
+        self._log_info("Workflow controller initialized successfully")
         return {"status": "initialized"}
     
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.shutdown()
+    
+    async def shutdown(self):
+        """End all sessions and release resources held by the workflow controller"""
+        # Ending a session closes its browser session too
+        for session_id in list(self.sessions):
+            await self.end_session(session_id)
+        
+        if self.voice_activator is not None:
+            try:
+                await self.voice_activator.stop_listening()
+            except Exception as e:
+                self._log_err("Error stopping voice activator: %s", e)
+            self.voice_activator = None
+        
+        if self._listener_workers:
+            # Give queued events (including the session-end ones above) a chance to be delivered
+            try:
+                await asyncio.wait_for(self._event_queue.join(), timeout=5.0)
+            except asyncio.TimeoutError:
+                self._log_warn("Timed out delivering queued workflow events")
+            for worker in self._listener_workers:
+                worker.cancel()
+            await asyncio.gather(*self._listener_workers, return_exceptions=True)
+            self._listener_workers = []
+            self._event_queue = None
+        
+        if self.http_session is not None:
+            await self.http_session.close()
+            self.http_session = None
+            browser_service.set_session(None)
+            email_service.set_session(None)
+        
+        self._log_info("Workflow controller shut down")
+    
     async def _handle_voice_event(self, event: Dict[str, Any]):
         """Handle voice events from the voice activator"""
-        logger.info(f"Received voice event: {event}")
+        self._log_info("Received voice event: %s", event)
         
         event_type = event.get("event")
         
@@ -100,31 +356,45 @@ class WorkflowController:
             if active_session:
                 await self._process_command(active_session, command)
             else:
-                logger.warning("Received command but no active session exists")
+                self._log_warn("Received command but no active session exists")
     
     async def create_session(self) -> Dict[str, Any]:
         """Create a new workflow session"""
-        import uuid
-        session_id = str(uuid.uuid4())
+        await self._evict_stale_sessions()
+        session_id = f"{self._session_id_prefix}{next(self._session_counter):016x}"
         
-        session = WorkflowSession(session_id=session_id)
+        session = WorkflowSession(session_id=session_id, on_event=self._handle_session_event)
+        self.sessions[session_id] = session
         session.add_event(
             state=WorkflowState.LISTENING,
             message="Session created, listening for commands"
         )
         
-        self.sessions[session_id] = session
-        logger.info(f"Created new workflow session: {session_id}")
-        
-        # Notify listeners
-        await self._notify_listeners(session.events[-1])
+        self._log_info("Created new workflow session: %s", session_id)
         
         return {"session_id": session_id, "status": "created"}
     
+    async def _evict_stale_sessions(self):
+        """End the least recently active sessions until there is room for a new one"""
+        while len(self.sessions) >= MAX_SESSIONS:
+            session_id = next(iter(self.sessions))
+            self._log_warn("Too many sessions, ending least recently active: %s", session_id)
+            await self.end_session(session_id)
+    
+    def resume_session(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Restore a session from WorkflowSession.snapshot() without replaying its events"""
+        session = WorkflowSession.from_snapshot(snapshot, on_event=self._handle_session_event)
+        self.sessions[session.session_id] = session
+        self._sessions_version += 1
+        self._track_active_session(session)
+        
+        self._log_info("Resumed workflow session: %s", session.session_id)
+        return {"session_id": session.session_id, "status": "resumed"}
+    
     async def end_session(self, session_id: str) -> Dict[str, Any]:
         """End a workflow session"""
         if session_id not in self.sessions:
-            logger.warning(f"Attempted to end non-existent session: {session_id}")
+            self._log_warn("Attempted to end non-existent session: %s", session_id)
             return {"status": "error", "message": "Session not found"}
         
         session = self.sessions[session_id]
@@ -137,7 +407,7 @@ class WorkflowController:
                     session_id=session.browser_session_id
                 )
             except Exception as e:
-                logger.error(f"Error closing browser session: {str(e)}")
+                self._log_err("Error closing browser session: %s", e)
         
         # Add final event and remove from active sessions
         session.add_event(
@@ -145,18 +415,26 @@ class WorkflowController:
             message="Session ended"
         )
         
-        # Notify listeners
-        await self._notify_listeners(session.events[-1])
-        
         # Remove from active sessions
         del self.sessions[session_id]
+        self._sessions_version += 1
         
-        logger.info(f"Ended workflow session: {session_id}")
+        self._log_info("Ended workflow session: %s", session_id)
         return {"status": "ended", "session_id": session_id}
     
     async def _process_command(self, session: WorkflowSession, command: str) -> Dict[str, Any]:
-        """Process a voice command"""
-        logger.info(f"Processing command for session {session.session_id}: {command}")
+        """Process a voice command, handing its events to batch listeners in one call"""
+        async with self.buffered():
+            return await self._dispatch_command(session, command)
+    
+    async def _dispatch_command(self, session: WorkflowSession, command: str) -> Dict[str, Any]:
+        """Route a voice command to its handler"""
+        self._log_info("Processing command for session %s: %s", session.session_id, command)
+        
+        # Reject commands while the session is still busy with a previous one
+        if not session.can_transition(WorkflowState.PROCESSING_COMMAND):
+            self._log_warn("Session %s is busy (%s), ignoring command", session.session_id, session.current_state.value)
+            return {"status": "error", "message": f"Session is busy: {session.current_state.value}"}
         
         # Update session state
         session.add_event(
@@ -165,62 +443,40 @@ class WorkflowController:
             message=f"Processing command: {command}"
         )
         
-        # Notify listeners
-        await self._notify_listeners(session.events[-1])
-        
         # Handle different commands
         # This is a simplified implementation - in a real system, you would use
         # more sophisticated NLU to understand commands
-        command_lower = command.lower()
-        
         try:
-            if "login" in command_lower or "log in" in command_lower:
-                return await self._handle_login_command(session)
-            
-            elif "inbox" in command_lower or "emails" in command_lower:
-                return await self._handle_inbox_command(session)
-            
-            elif "read" in command_lower and ("email" in command_lower or "message" in command_lower):
-                return await self._handle_read_email_command(session)
-            
-            elif "generate" in command_lower or "respond" in command_lower or "reply" in command_lower:
-                return await self._handle_generate_response_command(session)
+            match = _COMMAND_RE.match(command)
+            if match:
+                handler_name, kwargs = _COMMAND_HANDLERS[match.lastgroup]
+                return await getattr(self, handler_name)(session, **kwargs)
             
-            elif "submit" in command_lower or "send" in command_lower:
-                return await self._handle_submit_response_command(session, send=True)
-            
-            elif "save" in command_lower and "draft" in command_lower:
-                return await self._handle_submit_response_command(session, send=False)
+            # Unknown command
+            self._log_warn("Unknown command: %s", command)
+            session.add_event(
+                state=WorkflowState.ERROR,
+                message=f"Unknown command: {command}"
+            )
+            return {"status": "error", "message": "Unknown command"}
             
-            else:
-                # Unknown command
-                logger.warning(f"Unknown command: {command}")
-                session.add_event(
-                    state=WorkflowState.ERROR,
-                    message=f"Unknown command: {command}"
-                )
-                await self._notify_listeners(session.events[-1])
-                return {"status": "error", "message": "Unknown command"}
-                
         except Exception as e:
-            logger.error(f"Error processing command: {str(e)}")
+            self._log_err("Error processing command: %s", e)
             session.add_event(
                 state=WorkflowState.ERROR,
                 message=f"Error processing command: {str(e)}"
             )
-            await self._notify_listeners(session.events[-1])
             return {"status": "error", "message": str(e)}
     
     async def _handle_login_command(self, session: WorkflowSession) -> Dict[str, Any]:
         """Handle login command"""
-        logger.info(f"Handling login command for session {session.session_id}")
+        self._log_info("Handling login command for session %s", session.session_id)
         
         # Update session state
         session.add_event(
             state=WorkflowState.AUTHENTICATING,
             message="Authenticating to Slate CRM"
         )
-        await self._notify_listeners(session.events[-1])
         
         try:
             # Authenticate to CRM
@@ -238,7 +494,6 @@ class WorkflowController:
                     state=WorkflowState.LISTENING,
                     message="Authentication successful, listening for next command"
                 )
-                await self._notify_listeners(session.events[-1])
                 
                 return {"status": "success", "message": "Authentication successful"}
             else:
@@ -247,31 +502,28 @@ class WorkflowController:
                     state=WorkflowState.ERROR,
                     message=f"Authentication failed: {result.get('error')}"
                 )
-                await self._notify_listeners(session.events[-1])
                 
                 return {"status": "error", "message": "Authentication failed"}
                 
         except Exception as e:
-            logger.error(f"Error during authentication: {str(e)}")
+            self._log_err("Error during authentication: %s", e)
             session.add_event(
                 state=WorkflowState.ERROR,
                 message=f"Error during authentication: {str(e)}"
             )
-            await self._notify_listeners(session.events[-1])
             
             return {"status": "error", "message": str(e)}
     
     async def _handle_inbox_command(self, session: WorkflowSession) -> Dict[str, Any]:
         """Handle inbox navigation command"""
-        logger.info(f"Handling inbox command for session {session.session_id}")
+        self._log_info("Handling inbox command for session %s", session.session_id)
         
         if not session.browser_session_id:
-            logger.warning("Cannot navigate to inbox: Not authenticated")
+            self._log_warn("Cannot navigate to inbox: Not authenticated")
             session.add_event(
                 state=WorkflowState.ERROR,
                 message="Cannot navigate to inbox: Not authenticated"
             )
-            await self._notify_listeners(session.events[-1])
             return {"status": "error", "message": "Not authenticated"}
         
         # Update session state
@@ -279,7 +531,6 @@ class WorkflowController:
             state=WorkflowState.NAVIGATING,
             message="Navigating to inbox"
         )
-        await self._notify_listeners(session.events[-1])
         
         try:
             # Navigate to inbox
@@ -292,7 +543,6 @@ class WorkflowController:
                     state=WorkflowState.LISTENING,
                     message="Navigation successful, listening for next command"
                 )
-                await self._notify_listeners(session.events[-1])
                 
                 return {"status": "success", "message": "Navigation successful"}
             else:
@@ -301,31 +551,28 @@ class WorkflowController:
                     state=WorkflowState.ERROR,
                     message=f"Navigation failed: {result.get('error')}"
                 )
-                await self._notify_listeners(session.events[-1])
                 
                 return {"status": "error", "message": "Navigation failed"}
                 
         except Exception as e:
-            logger.error(f"Error during navigation: {str(e)}")
+            self._log_err("Error during navigation: %s", e)
             session.add_event(
                 state=WorkflowState.ERROR,
                 message=f"Error during navigation: {str(e)}"
             )
-            await self._notify_listeners(session.events[-1])
             
             return {"status": "error", "message": str(e)}
     
     async def _handle_read_email_command(self, session: WorkflowSession) -> Dict[str, Any]:
         """Handle read email command"""
-        logger.info(f"Handling read email command for session {session.session_id}")
+        self._log_info("Handling read email command for session %s", session.session_id)
         
         if not session.browser_session_id:
-            logger.warning("Cannot read email: Not authenticated")
+            self._log_warn("Cannot read email: Not authenticated")
             session.add_event(
                 state=WorkflowState.ERROR,
                 message="Cannot read email: Not authenticated"
             )
-            await self._notify_listeners(session.events[-1])
             return {"status": "error", "message": "Not authenticated"}
         
         # Update session state
@@ -333,7 +580,6 @@ class WorkflowController:
             state=WorkflowState.READING_EMAIL,
             message="Reading email"
         )
-        await self._notify_listeners(session.events[-1])
         
         try:
             # Process email using email service
@@ -350,7 +596,6 @@ class WorkflowController:
                 data={"email": result["email"]},
                 message=f"Email read: {result['email']['subject']}"
             )
-            await self._notify_listeners(session.events[-1])
             
             return {
                 "status": "success", 
@@ -359,26 +604,24 @@ class WorkflowController:
             }
                 
         except Exception as e:
-            logger.error(f"Error reading email: {str(e)}")
+            self._log_err("Error reading email: %s", e)
             session.add_event(
                 state=WorkflowState.ERROR,
                 message=f"Error reading email: {str(e)}"
             )
-            await self._notify_listeners(session.events[-1])
             
             return {"status": "error", "message": str(e)}
     
     async def _handle_generate_response_command(self, session: WorkflowSession) -> Dict[str, Any]:
         """Handle generate response command"""
-        logger.info(f"Handling generate response command for session {session.session_id}")
+        self._log_info("Handling generate response command for session %s", session.session_id)
         
         if not session.current_email_id:
-            logger.warning("Cannot generate response: No email selected")
+            self._log_warn("Cannot generate response: No email selected")
             session.add_event(
                 state=WorkflowState.ERROR,
                 message="Cannot generate response: No email selected"
             )
-            await self._notify_listeners(session.events[-1])
             return {"status": "error", "message": "No email selected"}
         
         # Update session state
@@ -386,7 +629,6 @@ class WorkflowController:
             state=WorkflowState.GENERATING_RESPONSE,
             message="Generating email response"
         )
-        await self._notify_listeners(session.events[-1])
         
         try:
             # Process email to get suggested response
@@ -403,7 +645,6 @@ class WorkflowController:
                 data={"draft_response": session.draft_response},
                 message="Response generated, ready for review"
             )
-            await self._notify_listeners(session.events[-1])
             
             return {
                 "status": "success", 
@@ -412,35 +653,32 @@ class WorkflowController:
             }
                 
         except Exception as e:
-            logger.error(f"Error generating response: {str(e)}")
+            self._log_err("Error generating response: %s", e)
             session.add_event(
                 state=WorkflowState.ERROR,
                 message=f"Error generating response: {str(e)}"
             )
-            await self._notify_listeners(session.events[-1])
             
             return {"status": "error", "message": str(e)}
     
     async def _handle_submit_response_command(self, session: WorkflowSession, send: bool) -> Dict[str, Any]:
         """Handle submit response command"""
-        logger.info(f"Handling submit response command for session {session.session_id}, send={send}")
+        self._log_info("Handling submit response command for session %s, send=%s", session.session_id, send)
         
         if not session.current_email_id:
-            logger.warning("Cannot submit response: No email selected")
+            self._log_warn("Cannot submit response: No email selected")
             session.add_event(
                 state=WorkflowState.ERROR,
                 message="Cannot submit response: No email selected"
             )
-            await self._notify_listeners(session.events[-1])
             return {"status": "error", "message": "No email selected"}
         
         if not session.draft_response:
-            logger.warning("Cannot submit response: No draft response created")
+            self._log_warn("Cannot submit response: No draft response created")
             session.add_event(
                 state=WorkflowState.ERROR,
                 message="Cannot submit response: No draft response created"
             )
-            await self._notify_listeners(session.events[-1])
             return {"status": "error", "message": "No draft response created"}
         
         # Update session state
@@ -448,7 +686,6 @@ class WorkflowController:
             state=WorkflowState.SUBMITTING,
             message=f"Submitting response as {'email' if send else 'draft'}"
         )
-        await self._notify_listeners(session.events[-1])
         
         try:
             # Submit draft response
@@ -461,15 +698,14 @@ class WorkflowController:
             
             action = "sent" if send else "saved as draft"
             
+            # Clear current email and draft
+            session.current_email_id = None
+            session.draft_response = None
+            
             session.add_event(
                 state=WorkflowState.LISTENING,
                 message=f"Response {action} successfully"
             )
-            await self._notify_listeners(session.events[-1])
-            
-            # Clear current email and draft
-            session.current_email_id = None
-            session.draft_response = None
             
             return {
                 "status": "success", 
@@ -477,43 +713,158 @@ class WorkflowController:
             }
                 
         except Exception as e:
-            logger.error(f"Error submitting response: {str(e)}")
+            self._log_err("Error submitting response: %s", e)
             session.add_event(
                 state=WorkflowState.ERROR,
                 message=f"Error submitting response: {str(e)}"
             )
-            await self._notify_listeners(session.events[-1])
             
             return {"status": "error", "message": str(e)}
     
+    def _handle_session_event(self, session: WorkflowSession, event: WorkflowEvent):
+        """Track the active session and notify listeners of a new session event"""
+        if session.session_id in self.sessions:
+            self.sessions.move_to_end(session.session_id)
+        self._sessions_version += 1
+        self._track_active_session(session)
+        self._notify_listeners(event)
+    
+    def _track_active_session(self, session: WorkflowSession):
+        """Keep the MRU pointer on the last session to change to a non-idle state"""
+        if session.current_state not in _TERMINAL_STATES:
+            self._mru_active_session_id = session.session_id
+        elif self._mru_active_session_id == session.session_id:
+            self._mru_active_session_id = None
+    
     def _get_active_session(self) -> Optional[WorkflowSession]:
         """Get the most recently active session, if any"""
-        if not self.sessions:
-            return None
+        session = self.sessions.get(self._mru_active_session_id)
+        if session is not None and session.current_state not in _TERMINAL_STATES:
+            return session
         
-        # Find most recent session that isn't in IDLE state
-        active_sessions = [s for s in self.sessions.values() if s.current_state != WorkflowState.IDLE]
+        # The pointer is stale (e.g. its session ended): fall back to the most
+        # recently started session that isn't in IDLE state
+        active_sessions = [s for s in self.sessions.values() if s.current_state not in _TERMINAL_STATES]
         if not active_sessions:
+            self._mru_active_session_id = None
             return None
         
-        # Sort by most recent start time
-        return sorted(active_sessions, key=lambda s: s.start_time, reverse=True)[0]
+        session = max(active_sessions, key=lambda s: s.start_ns)
+        self._mru_active_session_id = session.session_id
+        return session
+    
+    def register_event_listener(
+        self,
+        callback: Callable[[WorkflowEvent], None],
+        states: Optional[Iterable[WorkflowState]] = None,
+        blocking: bool = False
+    ):
+        """Register a callback for workflow events, optionally only for the given states
+        
+        Sync callbacks run inline on the event loop unless blocking is set, in which case
+        they run in a worker thread alongside the async listeners.
+        """
+        listener = callback
+        if blocking and not asyncio.iscoroutinefunction(callback):
+            async def listener(event: WorkflowEvent):
+                await asyncio.to_thread(callback, event)
+        
+        buckets = self._async_listeners if asyncio.iscoroutinefunction(listener) else self._sync_listeners
+        with self._listeners_lock:
+            self.event_listeners.append(callback)
+            for state in (WorkflowState if states is None else set(states)):
+                buckets[state] = buckets[state] + (listener,)
+        self._log_info("Registered new event listener, total: %s", len(self.event_listeners))
+    
+    def register_batch_listener(self, callback: Callable[[List[WorkflowEvent]], None]):
+        """Register a callback that receives events as a list, one call per buffered() block"""
+        with self._listeners_lock:
+            self._batch_listeners = self._batch_listeners + (callback,)
+    
+    @asynccontextmanager
+    async def buffered(self):
+        """Collect the events emitted inside the block and pass them to batch listeners on exit"""
+        if _event_buffer.get() is not None:
+            # Nested: the outermost block delivers
+            yield
+            return
+        
+        buffer: List[WorkflowEvent] = []
+        token = _event_buffer.set(buffer)
+        try:
+            yield
+        finally:
+            _event_buffer.reset(token)
+            if buffer:
+                self._notify_batch_listeners(buffer)
     
-    def register_event_listener(self, callback: Callable[[WorkflowEvent], None]):
-        """Register a callback for workflow events"""
-        self.event_listeners.append(callback)
-        logger.info(f"Registered new event listener, total: {len(self.event_listeners)}")
+    def _notify_batch_listeners(self, events: List[WorkflowEvent]):
+        """Hand a list of events to every batch listener"""
+        for listener in self._batch_listeners:
+            try:
+                listener(events)
+            except Exception as e:
+                self._log_err("Error in batch event listener: %s", e)
     
-    async def _notify_listeners(self, event: WorkflowEvent):
+    def _notify_listeners(self, event: WorkflowEvent):
         """Notify all registered listeners of a state change"""
-        for listener in self.event_listeners:
+        # Read each snapshot once, so the check and the dispatch see the same listeners
+        sync_listeners = self._sync_listeners[event.state]
+        async_listeners = self._async_listeners[event.state]
+        if not (sync_listeners or async_listeners or self._batch_listeners):
+            return
+        
+        for listener in sync_listeners:
             try:
-                if asyncio.iscoroutinefunction(listener):
-                    await listener(event)
-                else:
-                    listener(event)
+                listener(event)
             except Exception as e:
-                logger.error(f"Error in event listener: {str(e)}")
+                self._log_err("Error in event listener: %s", e)
+        
+        if self._batch_listeners:
+            buffer = _event_buffer.get()
+            if buffer is not None:
+                buffer.append(event)
+            else:
+                self._notify_batch_listeners([event])
+        
+        if not async_listeners:
+            return
+        
+        if self._event_queue is None:
+            # Not initialized yet, so there are no workers: deliver in a task of its own
+            task = asyncio.create_task(self._deliver_to_async_listeners(event))
+            self._pending_deliveries.add(task)
+            task.add_done_callback(self._pending_deliveries.discard)
+            return
+        
+        # Hand off to the workers so state transitions never wait on listeners;
+        # under a burst, drop the oldest pending event to make room
+        try:
+            self._event_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._event_queue.get_nowait()
+            self._event_queue.task_done()
+            self._log_warn("Workflow event queue full, dropped oldest event")
+            self._event_queue.put_nowait(event)
+    
+    async def _deliver_to_async_listeners(self, event: WorkflowEvent):
+        """Run the async listeners concurrently so one slow listener doesn't delay the rest"""
+        results = await asyncio.gather(
+            *(listener(event) for listener in self._async_listeners[event.state]),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self._log_err("Error in event listener: %s", result)
+    
+    async def _listener_worker(self):
+        """Deliver queued events to the async listeners until cancelled"""
+        while True:
+            event = await self._event_queue.get()
+            try:
+                await self._deliver_to_async_listeners(event)
+            finally:
+                self._event_queue.task_done()
     
     async def process_voice_command(self, command: str) -> Dict[str, Any]:
         """Process a voice command programmatically (not from voice activator)"""
@@ -527,27 +878,59 @@ class WorkflowController:
         # Process the command
         return await self._process_command(active_session, command)
     
-    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get information about a session"""
-        if session_id not in self.sessions:
-            return None
+    def _session_dict(self, session: WorkflowSession, include_event: bool = False) -> Dict[str, Any]:
+        """Build the public summary of a session
         
-        session = self.sessions[session_id]
+        The full last event (including its data) is only included on request;
+        otherwise just its state and message are. That plain summary is cached on
+        the session until its next event, so callers must not modify it.
+        """
+        if not include_event and session.summary_version == session.event_count:
+            return session.summary
         
-        return {
+        info = {
             "session_id": session.session_id,
             "browser_session_id": session.browser_session_id,
             "current_state": session.current_state,
             "current_email_id": session.current_email_id,
             "has_draft": bool(session.draft_response),
-            "start_time": session.start_time.isoformat(),
-            "events": len(session.events),
-            "last_event": session.events[-1].dict() if session.events else None
+            "start_time": session.start_time_iso,
+            "events": session.event_count
         }
+        
+        last_event = session.events[-1] if session.events else None
+        if include_event:
+            info["last_event"] = last_event.to_dict() if last_event else None
+        else:
+            info["last_state"] = last_event.state if last_event else None
+            info["last_message"] = last_event.message if last_event else None
+            session.summary = info
+            session.summary_version = session.event_count
+        return info
+    
+    def get_session(self, session_id: str, include_event: bool = False) -> Optional[Dict[str, Any]]:
+        """Get information about a session"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        
+        return self._session_dict(session, include_event)
+    
+    async def iter_sessions(self, include_event: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Yield information about each session without building a list"""
+        # Snapshot the sessions so ones ending mid-iteration don't break the loop
+        for session in list(self.sessions.values()):
+            yield self._session_dict(session, include_event)
     
-    async def get_all_sessions(self) -> List[Dict[str, Any]]:
-        """Get information about all sessions"""
-        return [await self.get_session(session_id) for session_id in self.sessions]
+    def get_all_sessions(self, include_event: bool = False) -> List[Dict[str, Any]]:
+        """Get information about all sessions (the plain list is cached until a session changes)"""
+        if include_event:
+            return [self._session_dict(session, True) for session in list(self.sessions.values())]
+        
+        if self._all_sessions_cache_version != self._sessions_version:
+            self._all_sessions_cache = [self._session_dict(session) for session in list(self.sessions.values())]
+            self._all_sessions_cache_version = self._sessions_version
+        return self._all_sessions_cache
 
 # Initialize controller
 workflow_controller = WorkflowController()
\ No newline at end of file
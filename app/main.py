@@ -1,11 +1,10 @@
 # app/main.py
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 import asyncio
 import os
-from dotenv import load_dotenv
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 import logging
@@ -17,12 +16,11 @@ from app.api.routes import api_router
 from app.core.logging import setup_logging
 from app.core.workflow_controller import workflow_controller
 from app.core.monitoring import service_monitor
+from app.core.exceptions import ServiceError
+from app.utils.static_page import CachingStaticFiles, StaticPage
 
-# Load environment variables
-load_dotenv()
-
-# Setup logging
-logger = setup_logging()
+# Logging is configured in the startup event rather than at import time
+logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -35,18 +33,44 @@ app = FastAPI(
 static_dir = Path("static")
 static_dir.mkdir(exist_ok=True)
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Mount static files; the page's script is served from static_src until setup_static.py has built it
+app.mount(
+    "/static",
+    CachingStaticFiles(directory="static", fallback_directory=Path("static_src")),
+    name="static"
+)
+
+# The UI page is read once (restart to pick up changes) and served from memory
+index_page = StaticPage.from_file(static_dir / "index.html")
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Restrict in production
+    allow_origins=settings.BACKEND_CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress large JSON responses such as email and session lists (level 1 keeps it CPU-cheap)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
+# Error handlers: routes let exceptions propagate and are logged once here
+@app.exception_handler(ServiceError)
+async def service_error_handler(request: Request, exc: ServiceError):
+    """Log a failed service call and return its error as JSON"""
+    logger.exception("Error handling %s %s: %s", request.method, request.url.path, exc.detail)
+    return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+
+@app.exception_handler(Exception)
+async def unhandled_error_handler(request: Request, exc: Exception):
+    """Log any other unhandled error and return it as a 500 JSON response"""
+    logger.exception("Unhandled error on %s %s: %s", request.method, request.url.path, exc)
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": str(exc)}
+    )
+
 # Include all API routes
 app.include_router(api_router, prefix="/api")
 
@@ -59,14 +83,11 @@ async def health_check():
 # Monitoring endpoints
 @app.get("/metrics", status_code=status.HTTP_200_OK)
 async def get_metrics():
-    """Get system and service metrics"""
-    system_metrics = service_monitor.get_system_metrics()
-    service_metrics = service_monitor.get_all_metrics()
-    
-    return {
-        "system": system_metrics,
-        "services": service_metrics
-    }
+    """Get system and service metrics (cached for up to a minute)"""
+    return Response(
+        content=service_monitor.get_metrics_json(),
+        media_type="application/json"
+    )
 
 @app.get("/metrics/{service_name}", status_code=status.HTTP_200_OK)
 async def get_service_metrics(service_name: str):
@@ -82,13 +103,13 @@ async def get_service_metrics(service_name: str):
 
 # Root endpoint with basic info
 @app.get("/", status_code=status.HTTP_200_OK)
-async def root():
+async def root(request: Request):
     """Serve the frontend UI"""
-    # Check if index.html exists in static directory
-    index_path = static_dir / "index.html"
-    
-    if index_path.exists():
-        return FileResponse(index_path)
+    if index_page is not None:
+        return index_page.response(
+            request.headers.get("if-none-match"),
+            request.headers.get("accept-encoding")
+        )
     else:
         # Fallback to API info if frontend not found
         return {
@@ -106,14 +127,14 @@ async def process_command(command: str):
     return await workflow_controller.process_voice_command(command)
 
 @app.get("/workflow/sessions")
-async def get_all_sessions():
+async def get_all_sessions(include_event: bool = False):
     """Get all active workflow sessions"""
-    return await workflow_controller.get_all_sessions()
+    return workflow_controller.get_all_sessions(include_event)
 
 @app.get("/workflow/session/{session_id}")
-async def get_session(session_id: str):
+async def get_session(session_id: str, include_event: bool = False):
     """Get information about a specific workflow session"""
-    session = await workflow_controller.get_session(session_id)
+    session = workflow_controller.get_session(session_id, include_event)
     if not session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -129,6 +150,7 @@ async def end_session(session_id: str):
 # Run on startup
 @app.on_event("startup")
 async def startup_event():
+    setup_logging()
     logger.info("Starting AI Enrollment Assistant API")
     
     # Start monitoring background task
@@ -148,4 +170,5 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down AI Enrollment Assistant API")
-    # Clean up resources
\ No newline at end of file
+    # Clean up resources
+    await workflow_controller.shutdown()
\ No newline at end of file
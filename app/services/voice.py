@@ -1,22 +1,69 @@
 # app/services/voice.py
 import logging
 import asyncio
-from typing import Dict, Any, Optional
-import base64
-from pydantic import BaseModel
+from typing import Dict, Any, Optional, AsyncIterator
+from pydantic import BaseModel, ConfigDict
+
+try:
+    # SIMD-accelerated drop-in replacement for the stdlib base64 module
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 logger = logging.getLogger(__name__)
 
+# Size of the Base64 slices fed to the streaming decoder (a multiple of 4)
+B64_CHUNK_SIZE = 1 << 16
+
+async def iter_base64_chunks(audio_data: str, chunk_size: int = B64_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Wrap a Base64 encoded string as an async stream of chunks for the voice service"""
+    for start in range(0, len(audio_data), chunk_size):
+        yield audio_data[start:start + chunk_size].encode("ascii")
+
 class WakeWordResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     detected: bool
     confidence: float
 
+# Results are built from trusted values inside the service, so skip validation
+_NO_WAKE_WORD = WakeWordResult.model_construct(detected=False, confidence=0.0)
+
 class VoiceService:
     """Service for voice-related functionality"""
     
+    async def decode_audio_stream(self, audio_stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Incrementally decode a Base64 encoded audio stream
+        
+        Parameters:
+        - audio_stream: Async iterator of Base64 encoded chunks of any size
+        
+        Returns:
+        - Async iterator of raw audio bytes, one item per decodable run of input
+        """
+        # Carry buffer for input not yet aligned to a 4-character Base64 quantum;
+        # the same bytearray is reused for the whole stream
+        carry = bytearray()
+        
+        async for chunk in audio_stream:
+            carry += chunk
+            aligned = len(carry) - len(carry) % 4
+            if not aligned:
+                continue
+            
+            with memoryview(carry) as view:
+                decoded = base64.b64decode(view[:aligned], validate=True)
+            del carry[:aligned]
+            yield decoded
+        
+        if carry:
+            # Leftover input is not valid Base64; let the decoder raise the error
+            base64.b64decode(bytes(carry), validate=True)
+    
     async def process_command(
         self, 
-        audio_data: str, 
+        audio_stream: AsyncIterator[bytes], 
         sample_rate: int = 16000, 
         channels: int = 1
     ) -> Dict[str, Any]:
@@ -24,15 +71,20 @@ class VoiceService:
         Process a voice command from audio data
         
         Parameters:
-        - audio_data: Base64 encoded audio data
+        - audio_stream: Base64 encoded audio data as an async stream of chunks
+          (see iter_base64_chunks for a whole-string payload)
         - sample_rate: Audio sample rate
         - channels: Number of audio channels
         
         Returns:
         - Dict containing the command detection results
         """
+        audio_bytes = 0
+        async for frames in self.decode_audio_stream(audio_stream):
+            audio_bytes += len(frames)
+        
         # TODO: Implement actual voice processing
-        logger.info("Processing voice command (placeholder)")
+        logger.info("Processing voice command (placeholder), %d bytes", audio_bytes)
         
         # This is a placeholder response
         return {
@@ -45,24 +97,32 @@ class VoiceService:
     
     async def detect_wake_word(
         self, 
-        audio_data: str, 
+        audio_stream: AsyncIterator[bytes], 
         sample_rate: int = 16000
     ) -> WakeWordResult:
         """
         Detect wake word in audio stream
         
         Parameters:
-        - audio_data: Base64 encoded audio data
+        - audio_stream: Base64 encoded audio data as an async stream of chunks
+          (see iter_base64_chunks for a whole-string payload)
         - sample_rate: Audio sample rate
         
         Returns:
         - WakeWordResult with detection status and confidence
         """
+        audio_bytes = 0
+        async for frames in self.decode_audio_stream(audio_stream):
+            audio_bytes += len(frames)
+        
+        if not audio_bytes:
+            return _NO_WAKE_WORD
+        
         # TODO: Implement actual wake word detection
-        logger.info("Detecting wake word (placeholder)")
+        logger.info("Detecting wake word (placeholder), %d bytes", audio_bytes)
         
         # This is a placeholder response
-        return WakeWordResult(detected=True, confidence=0.92)
+        return WakeWordResult.model_construct(detected=True, confidence=0.92)
     
     async def get_status(self) -> str:
         """Get the status of the voice service"""
@@ -77,13 +137,21 @@ voice_service = VoiceService()
 import logging
 import asyncio
 from typing import Dict, Any, Optional
-import uuid
+import secrets
 
 logger = logging.getLogger(__name__)
 
 class BrowserService:
     """Service for browser automation functionality"""
     
+    def __init__(self):
+        """Initialize the browser service"""
+        self.http_session = None  # Pooled aiohttp.ClientSession, injected by the workflow controller
+    
+    def set_session(self, session):
+        """Set the shared HTTP session used for outbound requests (None to clear it)"""
+        self.http_session = session
+    
     async def manage_session(
         self,
         action: str,
@@ -112,7 +180,7 @@ class BrowserService:
         
         # Generate a session ID if not provided
         if not session_id and action == 'start':
-            session_id = str(uuid.uuid4())
+            session_id = secrets.token_hex(16)
         
         # This is a placeholder response
         return {
@@ -144,7 +212,7 @@ class BrowserService:
         logger.info(f"Logging into CRM as {username}")
         
         # Generate a session ID
-        session_id = str(uuid.uuid4())
+        session_id = secrets.token_hex(16)
         
         # This is a placeholder response
         return {
@@ -189,13 +257,21 @@ browser_service = BrowserService()
 # app/services/email.py
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
 class EmailService:
     """Service for email-related functionality"""
     
+    def __init__(self):
+        """Initialize the email service"""
+        self.http_session = None  # Pooled aiohttp.ClientSession, injected by the workflow controller
+    
+    def set_session(self, session):
+        """Set the shared HTTP session used for outbound requests (None to clear it)"""
+        self.http_session = session
+    
     async def process_email(
         self,
         session_id: str,
@@ -277,20 +353,35 @@ class EmailService:
         Returns:
         - List of email summary objects
         """
+        return [email async for email in self.iter_emails(session_id, limit)]
+    
+    async def iter_emails(
+        self,
+        session_id: str,
+        limit: int = 10
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield emails in the inbox one at a time
+        
+        Parameters:
+        - session_id: Browser session ID
+        - limit: Maximum number of emails to yield
+        
+        Returns:
+        - Async iterator of email summary objects
+        """
         # TODO: Implement actual email listing
         logger.info(f"Listing emails for session {session_id}")
         
         # This is a placeholder response
-        return [
-            {
+        for i in range(1, min(limit + 1, 6)):
+            yield {
                 "email_id": f"email{i}",
                 "subject": f"Sample Email {i}",
                 "sender": f"student{i}@example.com",
                 "date": "2023-09-15T14:30:00Z",
                 "read": i % 2 == 0
             }
-            for i in range(1, min(limit + 1, 6))
-        ]
 
 # Initialize the email service
 email_service = EmailService()
\ No newline at end of file
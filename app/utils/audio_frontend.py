@@ -0,0 +1,62 @@
+# app/utils/audio_frontend.py
+import numpy as np
+
+# Frontend parameters the wake word features are specialized for
+SAMPLE_RATE = 16000
+N_FFT = 512
+N_MELS = 40
+
+def _hz_to_mel(hz):
+    """Convert frequencies in Hz to the (HTK) mel scale"""
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+def _mel_to_hz(mel):
+    """Convert mel scale values back to Hz"""
+    return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+def hann_window(n_fft: int = N_FFT) -> np.ndarray:
+    """
+    Build a periodic Hann window, pre-scaled from int16 to [-1, 1)
+    
+    Folding the int16 scaling into the window saves one pass over every frame.
+    """
+    window = np.hanning(n_fft + 1)[:-1] / 32768.0
+    return window.astype(np.float32)
+
+def mel_filterbank(
+    n_fft: int = N_FFT,
+    n_mels: int = N_MELS,
+    sample_rate: int = SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Build triangular mel filters as a (n_fft // 2 + 1, n_mels) matrix
+    
+    Laid out so a power spectrum can be multiplied by it directly.
+    """
+    mel_points = np.linspace(_hz_to_mel(0.0), _hz_to_mel(sample_rate / 2), n_mels + 2)
+    hz_points = _mel_to_hz(mel_points)
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)[:, None]
+    
+    lower, center, upper = hz_points[:-2], hz_points[1:-1], hz_points[2:]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+def mel_frontend(frame_i16: np.ndarray, mel_fb: np.ndarray, window: np.ndarray) -> np.ndarray:
+    """
+    Compute log-mel features for 16-bit PCM frames
+    
+    Parameters:
+    - frame_i16: int16 samples shaped (n_fft,) for one frame or (B, n_fft) for a batch
+    - mel_fb: Filterbank from mel_filterbank()
+    - window: Scaled window from hann_window()
+    
+    Returns:
+    - float32 array of n_mels log-mel energies per frame, shaped (n_mels,) or (B, n_mels)
+    """
+    # Window and int16 scaling in one multiply, straight to float32; a batch is
+    # handled by broadcasting, so each step is a single vectorized call
+    frame = np.multiply(frame_i16, window, dtype=np.float32)
+    spectrum = np.fft.rfft(frame, axis=-1)
+    power = spectrum.real * spectrum.real + spectrum.imag * spectrum.imag
+    return np.log(power.astype(np.float32) @ mel_fb + 1e-6)
@@ -0,0 +1,35 @@
+# app/utils/streaming.py
+from typing import Any, AsyncIterator
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+# Lists up to this many items are sent in one ORJSONResponse; larger ones are streamed
+STREAM_THRESHOLD = 50
+# Media type for newline-delimited JSON, one item per line
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+async def iter_json_array(items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Serialize an async iterator as a JSON array, one item per chunk"""
+    yield b"["
+    first = True
+    async for item in items:
+        if first:
+            first = False
+            yield orjson.dumps(item)
+        else:
+            yield b"," + orjson.dumps(item)
+    yield b"]"
+
+def stream_json_array(items: AsyncIterator[Any]) -> StreamingResponse:
+    """Stream an async iterator to the client as a JSON array"""
+    return StreamingResponse(iter_json_array(items), media_type="application/json")
+
+async def iter_ndjson(items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Serialize an async iterator as newline-delimited JSON, one item per chunk"""
+    async for item in items:
+        yield orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+
+def stream_ndjson(items: AsyncIterator[Any]) -> StreamingResponse:
+    """Stream an async iterator to the client as newline-delimited JSON"""
+    return StreamingResponse(iter_ndjson(items), media_type=NDJSON_MEDIA_TYPE)
@@ -1,17 +1,109 @@
 # app/utils/voice_activation.py
 import logging
 import asyncio
+import importlib
 import threading
-import queue
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 import time
 import os
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Union
 
-# Will be implemented later with actual voice recognition libraries
-# For now, we'll create a placeholder structure
+import numpy as np
+
+from app.utils.audio_frontend import N_FFT, N_MELS, hann_window, mel_filterbank, mel_frontend
+
+# Wake word and command recognition will be implemented later; audio capture
+# is already wired up through PyAudio when it is installed
 
 logger = logging.getLogger(__name__)
 
+def _import_optional(name: str):
+    """
+    Import an optional audio dependency on first use, or return None if it is missing
+    
+    Keeps PyAudio, onnxruntime and webrtcvad out of the import graph of
+    processes that never start listening.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+# Captured frames waiting to be processed; when full, new frames are dropped
+AUDIO_RING_SLOTS = 64
+# Length of each captured frame in seconds (1024 samples at 16 kHz)
+AUDIO_CHUNK_DURATION = 0.064
+# Most frames the listen task takes from the ring for one detector call
+LISTEN_BATCH_FRAMES = 8
+# Score above which the ONNX wake word model counts as a detection
+WAKE_WORD_THRESHOLD = 0.5
+# WebRTC VAD aggressiveness (0-3) and the frame length it is fed, in seconds
+VAD_MODE = 2
+VAD_FRAME_DURATION = 0.03
+# RMS level treated as speech when webrtcvad is not installed
+VAD_ENERGY_THRESHOLD = 300.0
+
+class PCMRingBuffer:
+    """
+    Fixed-size ring of int16 PCM frames for one producer and one consumer
+    
+    Frames are copied into preallocated slots, so the capture path allocates
+    nothing; the consumer reads slots in place and frees them, oldest first,
+    with release(). The producer may run on any thread; the consumer runs on
+    the given loop.
+    """
+    
+    def __init__(self, slots: int, frame_samples: int, loop: asyncio.AbstractEventLoop):
+        self._ring = np.zeros((slots, frame_samples), dtype=np.int16)
+        self._slots = slots
+        self._frame_samples = frame_samples
+        self._head = 0
+        self._read = 0  # Next slot get() hands out
+        self._tail = 0  # Oldest slot not yet released
+        self._loop = loop
+        self._free = threading.Semaphore(slots)
+        self._filled = asyncio.Semaphore(0)
+        self._closed = False
+    
+    def put(self, pcm_bytes: bytes) -> bool:
+        """Copy a frame into the next free slot; returns False if the ring is full"""
+        if not self._free.acquire(blocking=False):
+            return False
+        
+        frame = np.frombuffer(pcm_bytes, dtype=np.int16, count=self._frame_samples)
+        self._ring[self._head % self._slots] = frame
+        self._head += 1
+        self._loop.call_soon_threadsafe(self._filled.release)
+        return True
+    
+    async def get(self) -> Optional[np.ndarray]:
+        """Wait for the next frame and return a view of its slot, or None once closed"""
+        await self._filled.acquire()
+        if self._closed:
+            return None
+        frame = self._ring[self._read % self._slots]
+        self._read += 1
+        return frame
+    
+    def ready(self) -> bool:
+        """Whether get() would return a frame without waiting"""
+        return not self._closed and not self._filled.locked()
+    
+    def release(self, count: int = 1):
+        """Hand the oldest count slots returned by get() back to the producer"""
+        self._tail += count
+        self._free.release(count)
+    
+    def close(self):
+        """Wake a consumer waiting in get() (call from the loop)"""
+        self._closed = True
+        self._filled.release()
+    
+    def qsize(self) -> int:
+        """Frames waiting to be consumed"""
+        return self._head - self._tail
+
 class VoiceActivator:
     """Voice activation handler that listens for wake words and commands"""
     
@@ -20,7 +112,8 @@ class VoiceActivator:
         wake_word: str = "Hey Claude",
         callback: Optional[Callable] = None,
         sample_rate: int = 16000,
-        channels: int = 1
+        channels: int = 1,
+        model_path: Optional[str] = None
     ):
         """Initialize voice activator"""
         self.wake_word = wake_word
@@ -28,9 +121,49 @@ class VoiceActivator:
         self.sample_rate = sample_rate
         self.channels = channels
         self.is_listening = False
-        self.command_queue = queue.Queue()
-        self.listen_thread = None
+        # Produced and consumed on the event loop only, so a plain deque is enough
+        self.command_queue = deque()
+        self._listen_task = None
+        # PCM frames from the capture callback, consumed by the listen thread
+        self._audio_ring = None
+        self._pyaudio = None
+        self._audio = None
+        self._stream = None
+        # Wake word inference is CPU-bound C code, so it runs on a dedicated single
+        # worker: off the event loop, and never re-entered concurrently.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wake-word")
+        # Log-mel frontend tables for model-based detection, built once per activator
+        self._window = hann_window(N_FFT)
+        self._mel_fb = mel_filterbank(N_FFT, N_MELS, sample_rate)
+        self._model = None
+        self._model_input = None
+        # Silence gate in front of the detector; WebRTC VAD only takes mono 16-bit PCM
+        self._vad = None
+        self._vad_frame_samples = int(sample_rate * VAD_FRAME_DURATION)
+        webrtcvad = _import_optional("webrtcvad")
+        if webrtcvad is not None and channels == 1 and webrtcvad.valid_rate_and_frame_length(
+            sample_rate, self._vad_frame_samples
+        ):
+            self._vad = webrtcvad.Vad(VAD_MODE)
+        if model_path:
+            self._load_model(model_path)
+        
+    def _load_model(self, model_path: str):
+        """Load an (int8-quantized) ONNX wake word model for single-frame inference"""
+        onnxruntime = _import_optional("onnxruntime")
+        if onnxruntime is None:
+            logger.warning("onnxruntime is not installed, ignoring wake word model")
+            return
         
+        # One frame at a time on the detector thread: optimise for latency, not throughput
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        self._model = onnxruntime.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._model_input = self._model.get_inputs()[0].name
+    
     async def start_listening(self):
         """Start listening for wake word and commands"""
         if self.is_listening:
@@ -39,11 +172,12 @@ class VoiceActivator:
         
         logger.info(f"Starting to listen for wake word: '{self.wake_word}'")
         self.is_listening = True
+        frame_samples = int(self.sample_rate * AUDIO_CHUNK_DURATION) * self.channels
+        self._audio_ring = PCMRingBuffer(AUDIO_RING_SLOTS, frame_samples, asyncio.get_running_loop())
+        self._open_stream()
         
-        # Start listening in a separate thread to not block the main thread
-        self.listen_thread = threading.Thread(target=self._listen_process)
-        self.listen_thread.daemon = True
-        self.listen_thread.start()
+        # Consume frames on the event loop; inference itself runs on the detector thread
+        self._listen_task = asyncio.create_task(self._listen_loop())
         
         return {"status": "listening", "wake_word": self.wake_word}
     
@@ -55,50 +189,130 @@ class VoiceActivator:
         
         logger.info("Stopping voice listening")
         self.is_listening = False
+        self._close_stream()
+        
+        # Wake the listen task if it is waiting for a frame
+        self._audio_ring.close()
         
-        # Wait for thread to terminate
-        if self.listen_thread and self.listen_thread.is_alive():
-            self.listen_thread.join(timeout=2.0)
+        # Let it finish its current frame; wait_for cancels it on timeout
+        if self._listen_task is not None:
+            try:
+                await asyncio.wait_for(self._listen_task, 2.0)
+            except asyncio.TimeoutError:
+                logger.warning("Voice listening task did not stop in time")
+            self._listen_task = None
         
         return {"status": "stopped"}
     
-    def _listen_process(self):
-        """Background thread process for listening to audio"""
+    def _open_stream(self):
+        """Open a callback-mode microphone stream feeding the audio ring"""
+        pyaudio = _import_optional("pyaudio")
+        if pyaudio is None:
+            logger.warning("PyAudio is not installed, microphone capture is disabled")
+            return
+        
+        self._pyaudio = pyaudio
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=int(self.sample_rate * AUDIO_CHUNK_DURATION),
+            stream_callback=self._audio_callback
+        )
+    
+    def _close_stream(self):
+        """Stop and release the microphone stream"""
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: hand the frame to the listen task without blocking"""
+        if not self._audio_ring.put(in_data):
+            # The consumer is behind; drop the frame rather than stall capture
+            logger.debug("Audio ring full, dropping frame")
+        return (None, self._pyaudio.paContinue)
+    
+    async def _listen_loop(self):
+        """Background task processing captured audio frames"""
         try:
-            logger.info("Voice listening thread started")
+            logger.info("Voice listening task started")
             
-            # In a real implementation, this would use PyAudio or similar
-            # to capture audio and process it for wake word detection
-            # For now, we'll simulate with a placeholder
-            
-            while self.is_listening:
-                # Simulate processing
-                time.sleep(1.0)
+            while True:
+                # Waits until the capture callback delivers a frame (or stop closes the ring)
+                frame = await self._audio_ring.get()
+                if frame is None or not self.is_listening:
+                    break
+                
+                # Frames that piled up while the detector was busy go through it together
+                frames = [frame]
+                while len(frames) < LISTEN_BATCH_FRAMES and self._audio_ring.ready():
+                    frames.append(await self._audio_ring.get())
                 
-                # TODO: Implement actual wake word detection and command processing
-                # For now, we'll just log a message periodically
-                logger.debug("Listening for wake word...")
+                # Frames are read in place; their slots are only freed afterwards
+                try:
+                    # Most frames are silence: skip them before they reach the detector
+                    speech = [frame for frame in frames if self._is_speech(frame)]
+                    if len(speech) == 1:
+                        await self.process_audio_data(speech[0])
+                    elif speech:
+                        await self.process_audio_batch(np.stack(speech))
+                finally:
+                    self._audio_ring.release(len(frames))
                 
-        except Exception as e:
-            logger.error(f"Error in voice listening thread: {str(e)}")
+        except Exception:
+            logger.exception("Error in voice listening task")
         finally:
-            logger.info("Voice listening thread terminated")
+            logger.info("Voice listening task terminated")
+    
+    async def process_audio_batch(self, frames: np.ndarray) -> Dict[str, Any]:
+        """
+        Process several captured frames in one detector call
+        
+        Parameters:
+        - frames: int16 array shaped (B, frame_samples)
+        
+        Returns:
+        - Dict with detection results for the batch as a whole
+        """
+        # A contiguous batch is one run of PCM: one executor hop and one
+        # vectorized frontend pass instead of B of each
+        return await self.process_audio_data(np.ascontiguousarray(frames, dtype=np.int16))
+    
+    def _is_speech(self, frame: np.ndarray) -> bool:
+        """Cheap voice activity check for one captured frame"""
+        if self._vad is None:
+            rms = np.sqrt(np.mean(np.square(frame, dtype=np.float32)))
+            return rms >= VAD_ENERGY_THRESHOLD
+        
+        # WebRTC VAD takes 10/20/30 ms frames; speech in any of them counts
+        step = self._vad_frame_samples
+        for start in range(0, len(frame) - step + 1, step):
+            if self._vad.is_speech(frame[start:start + step].tobytes(), self.sample_rate):
+                return True
+        return False
     
-    async def process_audio_data(self, audio_data: bytes) -> Dict[str, Any]:
+    async def process_audio_data(self, audio_data: Union[bytes, np.ndarray]) -> Dict[str, Any]:
         """
         Process raw audio data for wake word or command
         
         Parameters:
-        - audio_data: Raw audio bytes
+        - audio_data: Raw 16-bit PCM bytes, or an int16 frame from the audio ring
         
         Returns:
         - Dict with detection results
         """
-        # This would be implemented with actual audio processing
-        # For now, we'll just return a placeholder result
-        
-        # Simulate wake word detection
-        is_wake_word = False  # Would be determined by actual processing
+        # Run wake word inference on the detector thread so the loop keeps serving requests
+        pcm = np.frombuffer(audio_data, dtype=np.int16)
+        is_wake_word = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._detect_wake_word, pcm
+        )
         
         if is_wake_word:
             logger.info(f"Wake word '{self.wake_word}' detected")
@@ -122,7 +336,7 @@ class VoiceActivator:
             logger.info(f"Command detected: {command}")
             
             # Add to command queue for processing
-            self.command_queue.put({
+            self.command_queue.append({
                 "command": command,
                 "timestamp": time.time()
             })
@@ -144,14 +358,26 @@ class VoiceActivator:
             "detected": False
         }
     
+    def _detect_wake_word(self, pcm: np.ndarray) -> bool:
+        """Run the wake word model over 16-bit PCM samples (blocking, detector thread only)"""
+        # Without a model (WAKE_WORD_MODEL_PATH unset) nothing is ever detected
+        if self._model is None:
+            return False
+        return self._score_wake_word(pcm) >= WAKE_WORD_THRESHOLD
+    
+    def _score_wake_word(self, pcm: np.ndarray) -> float:
+        """Score log-mel features of a frame with the ONNX model (blocking, detector thread only)"""
+        # All n_fft windows of the frame go through the frontend as one batch
+        windows = len(pcm) // N_FFT
+        features = mel_frontend(pcm[:windows * N_FFT].reshape(windows, N_FFT), self._mel_fb, self._window)
+        scores = self._model.run(None, {self._model_input: features[None]})[0]
+        return float(np.max(scores))
+    
     async def get_next_command(self) -> Optional[Dict[str, Any]]:
         """Get the next command from the queue if available"""
         try:
-            if self.command_queue.empty():
-                return None
-            
-            return self.command_queue.get_nowait()
-        except queue.Empty:
+            return self.command_queue.popleft()
+        except IndexError:
             return None
     
     async def get_status(self) -> Dict[str, Any]:
@@ -159,15 +385,16 @@ class VoiceActivator:
         return {
             "is_listening": self.is_listening,
             "wake_word": self.wake_word,
-            "commands_queued": self.command_queue.qsize()
+            "commands_queued": len(self.command_queue)
         }
 
 # Create a simple function to initialize the voice activator
 async def initialize_voice_activator(
     wake_word: str = "Hey Claude",
-    callback: Optional[Callable] = None
+    callback: Optional[Callable] = None,
+    model_path: Optional[str] = None
 ) -> VoiceActivator:
     """Initialize and start the voice activator"""
-    activator = VoiceActivator(wake_word=wake_word, callback=callback)
+    activator = VoiceActivator(wake_word=wake_word, callback=callback, model_path=model_path)
     await activator.start_listening()
     return activator
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Shared Playwright browser for the manual test scripts.
+The browser is launched once per process and reuses a persistent profile,
+so later runs start with a warm HTTP cache and existing logins.
+"""
+import atexit
+from playwright.sync_api import sync_playwright
+
+# Browser profile kept between runs
+PROFILE_DIR = ".pw-profile"
+
+_playwright = None
+_context = None
+
+def get_browser_context(headless=False):
+    """Launch the persistent browser context on first use and return it"""
+    global _playwright, _context
+    
+    if _context is None:
+        _playwright = sync_playwright().start()
+        _context = _playwright.chromium.launch_persistent_context(
+            user_data_dir=PROFILE_DIR,
+            headless=headless
+        )
+        atexit.register(close_browser)
+    
+    return _context
+
+def close_browser():
+    """Close the shared browser, if it was started"""
+    global _playwright, _context
+    
+    if _context is not None:
+        _context.close()
+        _playwright.stop()
+        _context = None
+        _playwright = None
@@ -0,0 +1,13 @@
+# gunicorn.conf.py
+import os
+
+# Run the ASGI app in Uvicorn workers managed by Gunicorn
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Import app.main once in the master before forking, so module-level state such
+# as the in-memory index page is shared copy-on-write by all workers. Per-worker
+# resources (the workflow controller, HTTP sessions) are still created in each
+# worker's startup event.
+preload_app = True
@@ -10,6 +10,10 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", "8000")),
-        reload=True,
+        # The reloader's file-watching supervisor is for development only
+        reload=os.getenv("ENV") == "dev",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",  # uvloop when installed, asyncio otherwise
+        http="auto",  # httptools when installed, h11 otherwise
         log_level=os.getenv("LOG_LEVEL", "info").lower()
     )
\ No newline at end of file
@@ -10,15 +10,20 @@ setup(
     install_requires=[
         "fastapi>=0.100.0",
         "uvicorn>=0.23.0",
+        "uvloop>=0.17.0; sys_platform != 'win32'",
+        "httptools>=0.6.0",
         "python-dotenv>=1.0.0",
         "pydantic>=2.0.0",
+        "orjson>=3.9.0",
         "SpeechRecognition>=3.10.0",
         "gTTS>=2.3.2",
         "pvporcupine>=2.2.0",
         "PyAudio>=0.2.13",
+        "numpy>=1.24.0",
         "langchain>=0.0.267",
         "langchain-openai>=0.0.2",
         "openai>=1.0.0",
+        "aiohttp>=3.8.6",
     ],
-    python_requires=">=3.9",
+    python_requires=">=3.10",
 )
\ No newline at end of file
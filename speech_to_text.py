@@ -0,0 +1,83 @@
+"""
+Speech recognition for the manual test scripts.
+Uses an on-device Vosk model when one is installed, so no audio leaves the
+machine and there is no network round trip; otherwise falls back to Google.
+"""
+import json
+import os
+import queue
+import time
+from pathlib import Path
+
+import speech_recognition as sr
+
+# Directory of an unpacked Vosk model (e.g. vosk-model-small-en-us-0.15)
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "model-small-en-us")
+SAMPLE_RATE = 16000
+# Longest phrase captured in one piece, in seconds
+PHRASE_TIME_LIMIT = 3
+# Saved ambient noise calibration, and how long it stays valid in seconds
+CALIBRATION_PATH = Path(".mic_cal.json")
+CALIBRATION_MAX_AGE = 3600
+
+_model = None
+
+def _load_model():
+    """Load the Vosk model once, or return None if Vosk or the model is missing"""
+    global _model
+    
+    if _model is None:
+        try:
+            from vosk import Model, SetLogLevel
+        except ImportError:
+            return None
+        if not os.path.isdir(VOSK_MODEL_PATH):
+            return None
+        
+        SetLogLevel(-1)
+        _model = Model(VOSK_MODEL_PATH)
+    
+    return _model
+
+def calibrate(recognizer, source):
+    """Set the energy threshold from a recent saved calibration, or measure and save it"""
+    try:
+        data = json.loads(CALIBRATION_PATH.read_text())
+        if time.time() - data["ts"] < CALIBRATION_MAX_AGE:
+            recognizer.energy_threshold = data["energy"]
+            # Keep adapting from the saved value as ambient noise changes
+            recognizer.dynamic_energy_threshold = True
+            return
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    recognizer.adjust_for_ambient_noise(source)
+    CALIBRATION_PATH.write_text(json.dumps({"energy": recognizer.energy_threshold, "ts": time.time()}))
+
+def transcribe(recognizer, audio):
+    """Turn captured audio into text, raising sr.UnknownValueError if nothing was understood"""
+    model = _load_model()
+    if model is None:
+        return recognizer.recognize_google(audio)
+    
+    from vosk import KaldiRecognizer
+    
+    kaldi = KaldiRecognizer(model, SAMPLE_RATE)
+    kaldi.AcceptWaveform(audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))
+    text = json.loads(kaldi.FinalResult())["text"]
+    if not text:
+        raise sr.UnknownValueError()
+    return text
+
+def listen_in_background(recognizer, microphone, phrase_time_limit=PHRASE_TIME_LIMIT):
+    """
+    Capture phrases on a background thread while the caller recognizes earlier ones.
+    Returns a queue of captured AudioData and the function that stops listening.
+    """
+    phrases = queue.Queue()
+    stop_listening = recognizer.listen_in_background(
+        microphone,
+        lambda _, audio: phrases.put(audio),
+        phrase_time_limit=phrase_time_limit
+    )
+    return phrases, stop_listening
@@ -0,0 +1,451 @@
+// static_src/app.js
+// Global variables
+let isListening = false;
+let currentSessionId = null;
+let statusSocket = null;
+
+// Polling fallback for browsers without WebSocket; a new poll aborts the one before it
+const STATUS_POLL_INTERVAL = 5000;
+let statusPollTimer = null;
+let pollAbort = null;
+
+// Log entries waiting for the next animation frame, and the cap on rendered entries
+const MAX_LOG_ENTRIES = 500;
+let pendingLogs = [];
+let logFlushScheduled = false;
+
+// Command keywords, matched case-insensitively without lowercasing the command
+const LOGIN_RX = /login/i;
+const READ_EMAIL_RX = /read[\s\S]*email|email[\s\S]*read/i;
+const GENERATE_RX = /generate|respond|reply/i;
+
+// Formatted time of the current second, shared by every entry logged in it
+let timestampCache = { second: 0, text: '' };
+let currentState = 'idle';
+let wakeWordDetected = false;
+let wakeWordTimer = null;
+
+// DOM elements
+const micButton = document.getElementById('mic-button');
+const voiceFeedback = document.getElementById('voice-feedback');
+const logContainer = document.getElementById('log-container');
+const clearLogButton = document.getElementById('clear-log');
+const commandInput = document.getElementById('command-input');
+const sendCommandButton = document.getElementById('send-command');
+const voiceStatus = document.getElementById('voice-status');
+const browserStatus = document.getElementById('browser-status');
+const sessionStatus = document.getElementById('session-status');
+
+// Indicator dot and label of each status, looked up once
+function statusNodes(container) {
+    return {
+        dot: container.querySelector('.status-indicator'),
+        label: container.querySelector('.status-label')
+    };
+}
+const voiceStatusNodes = statusNodes(voiceStatus);
+const browserStatusNodes = statusNodes(browserStatus);
+const sessionStatusNodes = statusNodes(sessionStatus);
+const currentStateElement = document.getElementById('current-state');
+const emailSection = document.getElementById('email-section');
+const emailFrom = document.getElementById('email-from');
+const emailDate = document.getElementById('email-date');
+const emailSubject = document.getElementById('email-subject');
+const emailBody = document.getElementById('email-body');
+const emailResponse = document.getElementById('email-response');
+const saveDraftButton = document.getElementById('save-draft');
+const sendResponseButton = document.getElementById('send-response');
+
+// Initialize the UI
+function initializeUI() {
+    // Add event listeners
+    micButton.addEventListener('click', toggleListening);
+    clearLogButton.addEventListener('click', clearLog);
+    sendCommandButton.addEventListener('click', sendCommand);
+    commandInput.addEventListener('keypress', (e) => {
+        if (e.key === 'Enter') {
+            sendCommand();
+        }
+    });
+    saveDraftButton.addEventListener('click', () => saveOrSendResponse(false));
+    sendResponseButton.addEventListener('click', () => saveOrSendResponse(true));
+
+    // Initial status update; afterwards the server pushes changes over a WebSocket
+    updateStatus();
+    
+    // Don't leave a status request running for a page that is going away
+    window.addEventListener('pagehide', () => pollAbort?.abort());
+
+    // Add initial log entry
+    addLogEntry('System initialized and ready', 'info');
+}
+
+// Toggle listening state
+function toggleListening() {
+    isListening = !isListening;
+    
+    if (isListening) {
+        micButton.classList.add('listening');
+        voiceFeedback.textContent = 'Listening...';
+        startListening();
+    } else {
+        micButton.classList.remove('listening');
+        voiceFeedback.textContent = 'Click to start listening';
+        stopListening();
+    }
+}
+
+// Placeholder for voice recognition start
+function startListening() {
+    addLogEntry('Started listening for commands', 'info');
+    updateVoiceStatus('active');
+    
+    // In a real implementation, a wake word detector would call onWakeWordDetected
+    // For now, we'll simulate a detection after a short delay
+    wakeWordTimer = setTimeout(onWakeWordDetected, 2000);
+}
+
+// Handle a wake word detection
+function onWakeWordDetected() {
+    wakeWordTimer = null;
+    if (!isListening || wakeWordDetected) {
+        return;
+    }
+    
+    wakeWordDetected = true;
+    addLogEntry('Wake word "Hey Claude" detected', 'success');
+    voiceFeedback.textContent = 'Detected "Hey Claude". Listening for command...';
+    
+    // Create a new session
+    createSession();
+}
+
+// Placeholder for voice recognition stop
+function stopListening() {
+    addLogEntry('Stopped listening for commands', 'info');
+    updateVoiceStatus('inactive');
+    wakeWordDetected = false;
+    
+    // Don't let a pending simulated detection fire after stopping
+    clearTimeout(wakeWordTimer);
+    wakeWordTimer = null;
+    
+    // In a real implementation, this would stop the voice recognition
+}
+
+// Create a new workflow session
+async function createSession() {
+    try {
+        const response = await fetch('/api/workflow/session', {
+            method: 'POST'
+        });
+        
+        if (response.ok) {
+            const data = await response.json();
+            currentSessionId = data.session_id;
+            addLogEntry(`Created new session: ${currentSessionId}`, 'success');
+            updateSessionStatus('active');
+            subscribeToSession(currentSessionId);
+        } else {
+            const error = await response.json();
+            addLogEntry(`Error creating session: ${error.detail}`, 'error');
+        }
+    } catch (error) {
+        addLogEntry(`Error creating session: ${error.message}`, 'error');
+    }
+}
+
+// Send a command to process
+async function sendCommand() {
+    const command = commandInput.value.trim();
+    
+    if (!command) {
+        return;
+    }
+    
+    addLogEntry(`Command: ${command}`, 'command-entry');
+    
+    try {
+        // If no session exists, create one
+        if (!currentSessionId) {
+            await createSession();
+        }
+        
+        const response = await fetch('/api/workflow/command', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                command: command,
+                session_id: currentSessionId
+            })
+        });
+        
+        if (response.ok) {
+            const data = await response.json();
+            addLogEntry(`Response: ${data.message || 'Command processed'}`, 'response-entry');
+            
+            // Update UI based on response
+            handleCommandResponse(data, command);
+            
+            // Clear command input
+            commandInput.value = '';
+        } else {
+            const error = await response.json();
+            addLogEntry(`Error processing command: ${error.detail}`, 'error');
+        }
+    } catch (error) {
+        addLogEntry(`Error processing command: ${error.message}`, 'error');
+    }
+}
+
+// Handle command response
+function handleCommandResponse(data, command) {
+    // Update state based on command and response
+    if (LOGIN_RX.test(command)) {
+        updateBrowserStatus(data.status === 'success' ? 'active' : 'inactive');
+    }
+    
+    // If it's a reading email command and successful
+    if (READ_EMAIL_RX.test(command) && 
+        data.status === 'success' && 
+        data.email) {
+        
+        // Show email section and populate
+        showEmailDetails(data.email);
+    }
+    
+    // If it's a generate response command and successful
+    if (GENERATE_RX.test(command) && 
+        data.status === 'success' && 
+        data.draft_response) {
+        
+        // Populate the response textarea
+        emailResponse.value = data.draft_response;
+    }
+}
+
+// Show email details
+function showEmailDetails(email) {
+    emailSection.style.display = 'block';
+    emailFrom.textContent = email.sender;
+    emailDate.textContent = new Date(email.date).toLocaleString();
+    emailSubject.textContent = email.subject;
+    emailBody.textContent = email.body;
+    
+    // Scroll to email section
+    emailSection.scrollIntoView({ behavior: 'smooth' });
+}
+
+// Save or send response
+async function saveOrSendResponse(send) {
+    if (!currentSessionId || !emailResponse.value.trim()) {
+        addLogEntry('Cannot save/send: No session or empty response', 'warning');
+        return;
+    }
+    
+    const action = send ? 'send' : 'save as draft';
+    addLogEntry(`Attempting to ${action} response`, 'info');
+    
+    try {
+        // Send the appropriate command
+        const command = send ? 'send response' : 'save as draft';
+        
+        const response = await fetch('/api/workflow/command', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                command: command,
+                session_id: currentSessionId
+            })
+        });
+        
+        if (response.ok) {
+            const data = await response.json();
+            const actionPast = send ? 'sent' : 'saved as draft';
+            addLogEntry(`Response ${actionPast} successfully`, 'success');
+            
+            // Clear the email section after successful action
+            if (send) {
+                emailSection.style.display = 'none';
+                emailResponse.value = '';
+            }
+        } else {
+            const error = await response.json();
+            addLogEntry(`Error ${action} response: ${error.detail}`, 'error');
+        }
+    } catch (error) {
+        addLogEntry(`Error ${action} response: ${error.message}`, 'error');
+    }
+}
+
+// Add log entry
+function logTimestamp() {
+    const second = Math.floor(Date.now() / 1000);
+    if (second !== timestampCache.second) {
+        timestampCache = { second, text: new Date(second * 1000).toLocaleTimeString() };
+    }
+    return timestampCache.text;
+}
+
+function addLogEntry(message, type = 'info') {
+    const timestamp = logTimestamp();
+    pendingLogs.push({ message, type, timestamp });
+    
+    // Bursts of entries are rendered together, with one layout per frame
+    if (!logFlushScheduled) {
+        logFlushScheduled = true;
+        requestAnimationFrame(flushLogs);
+    }
+}
+
+// Render all pending log entries in one DOM update
+function flushLogs() {
+    logFlushScheduled = false;
+    
+    const fragment = document.createDocumentFragment();
+    for (const { message, type, timestamp } of pendingLogs) {
+        // A repeat of the newest line bumps its counter instead of adding a node
+        const sig = `${type}|${message}`;
+        const last = fragment.lastElementChild || logContainer.lastElementChild;
+        if (last && last.dataset.sig === sig) {
+            const count = Number(last.dataset.count) + 1;
+            last.dataset.count = count;
+            last.querySelector('.timestamp').textContent = `[${timestamp}]`;
+            last.querySelector('.repeat').textContent = ` \u00d7${count}`;
+            continue;
+        }
+        
+        const entry = document.createElement('div');
+        entry.className = `log-entry ${type}`;
+        entry.dataset.sig = sig;
+        entry.dataset.count = 1;
+        entry.innerHTML = `<span class="timestamp">[${timestamp}]</span> <span class="message">${message}</span><span class="repeat"></span>`;
+        fragment.appendChild(entry);
+    }
+    pendingLogs = [];
+    
+    logContainer.appendChild(fragment);
+    
+    // Keep the DOM bounded during long sessions
+    while (logContainer.childElementCount > MAX_LOG_ENTRIES) {
+        logContainer.firstElementChild.remove();
+    }
+    
+    // Scroll to bottom
+    logContainer.scrollTop = logContainer.scrollHeight;
+}
+
+// Clear log
+function clearLog() {
+    pendingLogs = [];
+    logContainer.innerHTML = '';
+    addLogEntry('Log cleared', 'info');
+}
+
+// Update status indicators
+function setStatus(nodes, status, activeText, inactiveText) {
+    const active = status === 'active';
+    nodes.dot.className = `status-indicator ${active ? 'status-active' : 'status-inactive'}`;
+    nodes.label.textContent = active ? activeText : inactiveText;
+}
+
+function updateVoiceStatus(status) {
+    setStatus(voiceStatusNodes, status, 'Active', 'Inactive');
+}
+
+function updateBrowserStatus(status) {
+    setStatus(browserStatusNodes, status, 'Active', 'Inactive');
+}
+
+function updateSessionStatus(status) {
+    setStatus(sessionStatusNodes, status, 'Session active', 'No active session');
+}
+
+// Update current state
+function updateCurrentState(state) {
+    currentState = state;
+    currentStateElement.textContent = state.charAt(0).toUpperCase() + state.slice(1);
+}
+
+// Apply a session summary from the REST API or the WebSocket
+function handleStatus(data) {
+    updateCurrentState(data.current_state);
+    
+    // Update browser status based on browser_session_id
+    updateBrowserStatus(data.browser_session_id ? 'active' : 'inactive');
+    
+    // If session has a current email, show it
+    if (data.current_email_id && emailSection.style.display === 'none') {
+        // This would need an additional API call to get email details
+        // For now, we'll just log it
+        addLogEntry(`Session has active email: ${data.current_email_id}`, 'info');
+    }
+}
+
+// Receive session updates as they happen instead of polling
+function subscribeToSession(sessionId) {
+    if (statusSocket) {
+        statusSocket.close();
+    }
+    
+    if (!('WebSocket' in window)) {
+        if (!statusPollTimer) {
+            statusPollTimer = setInterval(updateStatus, STATUS_POLL_INTERVAL);
+        }
+        return;
+    }
+    
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${protocol}://${window.location.host}/api/workflow/ws/session/${sessionId}`);
+    socket.onmessage = (e) => handleStatus(JSON.parse(e.data));
+    socket.onclose = () => {
+        // Fall back to one REST check to find out whether the session is still there
+        if (statusSocket === socket) {
+            statusSocket = null;
+            updateStatus();
+        }
+    };
+    statusSocket = socket;
+}
+
+// Fetch the current session status
+async function updateStatus() {
+    if (!currentSessionId) {
+        clearInterval(statusPollTimer);
+        statusPollTimer = null;
+        return;
+    }
+    
+    pollAbort?.abort();
+    const controller = new AbortController();
+    pollAbort = controller;
+    
+    try {
+        const response = await fetch(`/api/workflow/session/${currentSessionId}`, {
+            signal: controller.signal
+        });
+        
+        if (response.ok) {
+            handleStatus(await response.json());
+        } else {
+            // Session might have been closed or expired
+            updateSessionStatus('inactive');
+            currentSessionId = null;
+        }
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            addLogEntry(`Error updating status: ${error.message}`, 'error');
+        }
+    } finally {
+        if (pollAbort === controller) {
+            pollAbort = null;
+        }
+    }
+}
+
+// Initialize the UI on page load
+document.addEventListener('DOMContentLoaded', initializeUI);
@@ -1,31 +1,35 @@
-from playwright.sync_api import sync_playwright
+import threading
 import time
+from pathlib import Path
+
+from browser_session import get_browser_context
 
 def test_browser():
     """Simple test to check if browser automation is working"""
     print("Testing browser automation...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-        
-        # Navigate to a test site
-        print("Navigating to example.com...")
-        page.goto("https://example.com")
-        
-        # Get the title
-        title = page.title()
-        print(f"Page title: {title}")
-        
-        # Take a screenshot
-        page.screenshot(path="browser_test.png")
-        print("Screenshot saved as browser_test.png")
-        
-        # Wait a moment to see the page
-        time.sleep(3)
-        
-        browser.close()
-        return True
+    # The browser itself stays open for reuse; only the page is closed
+    page = get_browser_context().new_page()
+    
+    # Navigate to a test site
+    print("Navigating to example.com...")
+    page.goto("https://example.com")
+    
+    # Get the title
+    title = page.title()
+    print(f"Page title: {title}")
+    
+    # Take a screenshot in memory (JPEG encodes much faster than PNG) and write
+    # it to disk on a background thread
+    screenshot = page.screenshot(type="jpeg", quality=70)
+    threading.Thread(target=Path("browser_test.jpg").write_bytes, args=(screenshot,)).start()
+    print("Screenshot saved as browser_test.jpg")
+    
+    # Wait a moment to see the page
+    time.sleep(3)
+    
+    page.close()
+    return True
 
 if __name__ == "__main__":
     test_browser()
\ No newline at end of file
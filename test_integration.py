@@ -1,46 +1,67 @@
+import queue
+
 import speech_recognition as sr
-from playwright.sync_api import sync_playwright
+
+from browser_session import get_browser_context
+from speech_to_text import calibrate, listen_in_background, transcribe
+
+# Seconds to wait for the next phrase before giving up
+PHRASE_TIMEOUT = 5
 
 def simple_voice_command():
     """Listen for a voice command and perform a browser action"""
     recognizer = sr.Recognizer()
+    microphone = sr.Microphone()
     
     print("Say a command like 'open website' or 'navigate to Google'")
-    with sr.Microphone() as source:
-        recognizer.adjust_for_ambient_noise(source)
-        print("Listening...")
-        audio = recognizer.listen(source, timeout=5)
+    with microphone as source:
+        calibrate(recognizer, source)
+    print("Listening...")
+    
+    # Capture runs on a background thread, so the next phrase is being recorded
+    # while the previous one is recognized
+    phrases, stop_listening = listen_in_background(recognizer, microphone)
     
     try:
-        text = recognizer.recognize_google(audio)
-        print(f"Command recognized: {text}")
-        
-        # Simple command processing
-        if "open website" in text.lower() or "navigate" in text.lower():
-            url = "https://google.com"  # Default
-            
-            if "google" in text.lower():
-                url = "https://google.com"
-            elif "example" in text.lower():
-                url = "https://example.com"
-                
-            # Execute browser action
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=False)
-                page = browser.new_page()
-                print(f"Navigating to {url}...")
-                page.goto(url)
-                
-                # Wait for user to see the result
-                input("Press Enter to close the browser...")
-                browser.close()
-        else:
-            print("Command not recognized. Try 'open website' or 'navigate to Google'")
+        while True:
+            try:
+                audio = phrases.get(timeout=PHRASE_TIMEOUT)
+            except queue.Empty:
+                print("No command heard")
+                return
             
-    except sr.UnknownValueError:
-        print("Could not understand audio")
+            try:
+                text = transcribe(recognizer, audio)
+                break
+            except sr.UnknownValueError:
+                print("Could not understand audio, listening again...")
     except sr.RequestError as e:
         print(f"Request error: {e}")
+        return
+    finally:
+        stop_listening(wait_for_stop=False)
+    
+    print(f"Command recognized: {text}")
+    
+    # Simple command processing
+    if "open website" in text.lower() or "navigate" in text.lower():
+        url = "https://google.com"  # Default
+        
+        if "google" in text.lower():
+            url = "https://google.com"
+        elif "example" in text.lower():
+            url = "https://example.com"
+            
+        # Execute browser action in the shared browser
+        page = get_browser_context().new_page()
+        print(f"Navigating to {url}...")
+        page.goto(url)
+        
+        # Wait for user to see the result
+        input("Press Enter to close the page...")
+        page.close()
+    else:
+        print("Command not recognized. Try 'open website' or 'navigate to Google'")
 
 if __name__ == "__main__":
-    simple_voice_command()
\ No newline at end of file
+    simple_voice_command()
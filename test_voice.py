@@ -1,5 +1,7 @@
 import speech_recognition as sr
 
+from speech_to_text import calibrate, transcribe
+
 def test_microphone():
     """Simple test to check if microphone is working"""
     recognizer = sr.Recognizer()
@@ -7,12 +9,12 @@ def test_microphone():
     print("Microphone test - please speak after 'Listening...'")
     with sr.Microphone() as source:
         print("Adjusting for ambient noise...")
-        recognizer.adjust_for_ambient_noise(source)
+        calibrate(recognizer, source)
         print("Listening...")
         audio = recognizer.listen(source, timeout=5)
         
     try:
-        text = recognizer.recognize_google(audio)
+        text = transcribe(recognizer, audio)
         print(f"Recognized: {text}")
         return True
     except sr.UnknownValueError:
@@ -0,0 +1,39 @@
+# tests/api/test_voice.py
+import importlib.util
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# The voice router lives in app/api/routes/routes.py. Load that file on its own:
+# importing it through the app.api.routes package would also pull in every other
+# router and its services.
+_spec = importlib.util.spec_from_file_location(
+    "app.api.routes.routes",
+    Path(__file__).resolve().parents[2] / "app" / "api" / "routes" / "routes.py"
+)
+_routes = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_routes)
+router = _routes.router
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+# Test that malformed Base64 audio is rejected as a client error
+@pytest.mark.parametrize("path", ["/voice/process", "/voice/wake-word/detect"])
+@pytest.mark.parametrize("audio_data", ["!!notb64", "abc", "é"])
+def test_invalid_audio_data(client, path, audio_data):
+    response = client.post(path, json={"audio_data": audio_data})
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "audio_data is not valid Base64"
+
+# Test that valid Base64 audio is accepted
+def test_valid_audio_data(client):
+    response = client.post("/voice/wake-word/detect", json={"audio_data": "AAAA"})
+    
+    assert response.status_code == 200
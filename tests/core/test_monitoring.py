@@ -0,0 +1,99 @@
+# tests/core/test_monitoring.py
+import pytest
+
+from app.core.monitoring import ServiceMetrics, ServiceMonitor
+
+# Test the response time ring buffer
+def test_response_times_are_bounded():
+    metrics = ServiceMetrics(service_name="test")
+
+    for i in range(150):
+        metrics.record_request(success=True, response_time=float(i))
+
+    # Only the last 100 samples (50..149) are kept
+    assert len(metrics.response_times) == 100
+    assert metrics.response_times[0] == 50.0
+    assert metrics.avg_response_time == pytest.approx(sum(range(50, 150)) / 100)
+
+# Test average with no samples
+def test_avg_response_time_empty():
+    metrics = ServiceMetrics(service_name="test")
+
+    assert metrics.avg_response_time is None
+
+# Test the 95th percentile response time
+def test_p95_response_time():
+    metrics = ServiceMetrics(service_name="test")
+
+    assert metrics.p95_response_time is None
+
+    for i in range(1, 101):
+        metrics.record_request(success=True, response_time=float(i))
+
+    assert metrics.p95_response_time == 95.0
+
+# Test that core services are recorded in their fixed slots
+def test_record_request_core_service():
+    monitor = ServiceMonitor()
+
+    monitor.record_request("email", success=False, response_time=5.0, error="boom")
+
+    metrics = monitor.get_service_metrics("email")
+    assert metrics.requests_total == 1
+    assert metrics.requests_error == 1
+    assert metrics.last_error == "boom"
+    assert metrics.last_error_time is not None
+
+# Test that unknown services are registered on first use
+def test_record_request_new_service():
+    monitor = ServiceMonitor()
+
+    monitor.record_request("crm", success=True, response_time=1.0)
+
+    assert monitor.get_service_metrics("crm").requests_success == 1
+
+# Test that to_dict picks up requests recorded after a previous call
+def test_to_dict_refreshes_after_record():
+    metrics = ServiceMetrics(service_name="test")
+
+    assert metrics.to_dict()["requests"]["total"] == 0
+
+    metrics.record_request(success=True, response_time=2.0)
+
+    data = metrics.to_dict()
+    assert data["requests"]["total"] == 1
+    assert data["response_time"]["average"] == "2.00ms"
+
+# Test that modifying a to_dict result leaves the cached counters alone
+def test_to_dict_returns_copies():
+    metrics = ServiceMetrics(service_name="test")
+    metrics.record_request(success=True, response_time=2.0)
+
+    metrics.to_dict()["requests"]["total"] = 99
+
+    assert metrics.to_dict()["requests"]["total"] == 1
+
+# Test that timed routes record failures and surface them as ServiceError
+def test_timed_route_records_failure():
+    from fastapi import APIRouter, FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core.exceptions import ServiceError
+    from app.core.monitoring import service_monitor, timed_route
+
+    router = APIRouter(route_class=timed_route("timed-test"))
+
+    @router.get("/fail")
+    async def fail():
+        raise ValueError("boom")
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    with pytest.raises(ServiceError):
+        client.get("/fail")
+
+    metrics = service_monitor.get_service_metrics("timed-test")
+    assert metrics.requests_error == 1
+    assert metrics.last_error == "boom"
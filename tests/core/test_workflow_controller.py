@@ -1,24 +1,39 @@
 # tests/core/test_workflow_controller.py
 import pytest
+import pytest_asyncio
 import asyncio
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import uuid
 
 from app.core.workflow_controller import WorkflowController, WorkflowState, WorkflowSession
 
+# Voice activator stand-in, cheaper than a mock for tests that never inspect it
+class _StubActivator:
+    async def start_listening(self):
+        pass
+    
+    async def stop_listening(self):
+        pass
+
+async def _stub_initialize_voice_activator(*args, **kwargs):
+    return _StubActivator()
+
 # Fixture for a workflow controller
-@pytest.fixture
-async def workflow_controller():
+@pytest_asyncio.fixture
+async def workflow_controller(monkeypatch):
     controller = WorkflowController()
     
-    # Mock the voice activator to avoid real initialization
-    with patch('app.utils.voice_activation.initialize_voice_activator') as mock_init:
-        mock_activator = MagicMock()
-        mock_init.return_value = mock_activator
-        
-        await controller.initialize()
-        
-        yield controller
+    # Stub the voice activator to avoid real initialization
+    monkeypatch.setattr(
+        'app.core.workflow_controller.initialize_voice_activator',
+        _stub_initialize_voice_activator
+    )
+    
+    await controller.initialize()
+    
+    yield controller
+    
+    await controller.shutdown()
 
 # Test session creation
 @pytest.mark.asyncio
@@ -65,7 +80,7 @@ async def test_get_session(workflow_controller):
     session_id = create_result["session_id"]
     
     # Get the session info
-    session_info = await workflow_controller.get_session(session_id)
+    session_info = workflow_controller.get_session(session_id)
     
     assert session_info["session_id"] == session_id
     assert session_info["current_state"] == WorkflowState.LISTENING
@@ -83,7 +98,7 @@ async def test_get_all_sessions(workflow_controller):
     await workflow_controller.create_session()
     
     # Get all sessions
-    sessions = await workflow_controller.get_all_sessions()
+    sessions = workflow_controller.get_all_sessions()
     
     assert len(sessions) == 2
     assert all("session_id" in session for session in sessions)
@@ -120,13 +135,11 @@ async def test_login_command(workflow_controller):
             "message": "Authentication successful"
         }
         
-        # Mock the process command to call our handler directly
-        with patch.object(workflow_controller, '_process_command', wraps=workflow_controller._process_command) as mock_process:
-            result = await workflow_controller.process_voice_command("login to Slate")
-            
-            assert result["status"] == "success"
-            assert result["message"] == "Authentication successful"
-            mock_login.assert_called_once()
+        result = await workflow_controller.process_voice_command("login to Slate")
+        
+        assert result["status"] == "success"
+        assert result["message"] == "Authentication successful"
+        mock_login.assert_called_once()
 
 # Test event listener registration
 @pytest.mark.asyncio
@@ -146,4 +159,312 @@ async def test_event_listener(workflow_controller):
     
     # Get the event that was passed to the listener
     event = mock_listener.call_args[0][0]
-    assert event.state == WorkflowState.LISTENING
\ No newline at end of file
+    assert event.state == WorkflowState.LISTENING
+
+# Test iterating over sessions
+@pytest.mark.asyncio
+async def test_iter_sessions(workflow_controller):
+    first = await workflow_controller.create_session()
+    second = await workflow_controller.create_session()
+    
+    session_ids = [session["session_id"] async for session in workflow_controller.iter_sessions()]
+    
+    assert session_ids == [first["session_id"], second["session_id"]]
+
+# Test that the active session follows the most recent activity
+@pytest.mark.asyncio
+async def test_get_active_session(workflow_controller):
+    first = await workflow_controller.create_session()
+    second = await workflow_controller.create_session()
+    
+    assert workflow_controller._get_active_session().session_id == second["session_id"]
+    
+    # Ending the active session falls back to the remaining one
+    await workflow_controller.end_session(second["session_id"])
+    assert workflow_controller._get_active_session().session_id == first["session_id"]
+    
+    await workflow_controller.end_session(first["session_id"])
+    assert workflow_controller._get_active_session() is None
+
+# Test that commands are dispatched to the right handler
+@pytest.mark.asyncio
+@pytest.mark.parametrize("command,handler,kwargs", [
+    ("Log in to Slate", "_handle_login_command", {}),
+    ("open my emails", "_handle_inbox_command", {}),
+    ("read the first message", "_handle_read_email_command", {}),
+    ("send me the email to read", "_handle_read_email_command", {}),
+    ("write a reply", "_handle_generate_response_command", {}),
+    ("send it", "_handle_submit_response_command", {"send": True}),
+    ("save as draft", "_handle_submit_response_command", {"send": False}),
+])
+async def test_command_dispatch(workflow_controller, command, handler, kwargs):
+    await workflow_controller.create_session()
+    
+    with patch.object(workflow_controller, handler, new_callable=AsyncMock) as mock_handler:
+        mock_handler.return_value = {"status": "success"}
+        
+        await workflow_controller.process_voice_command(command)
+        
+        session = workflow_controller._get_active_session()
+        mock_handler.assert_awaited_once_with(session, **kwargs)
+
+# Test that session event history is bounded
+def test_session_events_are_bounded():
+    session = WorkflowSession(session_id="test")
+    
+    for _ in range(100):
+        session.add_event(state=WorkflowState.LISTENING)
+    
+    assert len(session.events) == 64
+    assert session.event_count == 100
+
+# Test that each session gets its own start time
+def test_session_start_times_are_per_instance():
+    first = WorkflowSession(session_id="first")
+    second = WorkflowSession(session_id="second")
+    
+    assert second.start_ns > first.start_ns
+    assert second.start_time >= first.start_time
+
+# Test that async listeners are notified even if another one fails
+@pytest.mark.asyncio
+async def test_async_event_listeners(workflow_controller):
+    received = []
+    
+    async def failing_listener(event):
+        raise RuntimeError("listener failed")
+    
+    async def recording_listener(event):
+        received.append(event)
+    
+    workflow_controller.register_event_listener(failing_listener)
+    workflow_controller.register_event_listener(recording_listener)
+    
+    await workflow_controller.create_session()
+    
+    # Async listeners are notified by the background workers
+    await workflow_controller._event_queue.join()
+    
+    assert len(received) == 1
+    assert received[0].state == WorkflowState.LISTENING
+
+# Test the async context manager lifecycle
+@pytest.mark.asyncio
+async def test_context_manager_shuts_down():
+    with patch('app.core.workflow_controller.initialize_voice_activator') as mock_init:
+        mock_activator = AsyncMock()
+        mock_init.return_value = mock_activator
+        
+        async with WorkflowController() as controller:
+            await controller.create_session()
+            http_session = controller.http_session
+        
+        assert controller.sessions == {}
+        assert http_session.closed
+        mock_activator.stop_listening.assert_awaited_once()
+
+# Test that invalid state transitions are rejected
+def test_invalid_transition_rejected():
+    session = WorkflowSession(session_id="test")
+    session.add_event(state=WorkflowState.LISTENING)
+    
+    with pytest.raises(ValueError):
+        session.add_event(state=WorkflowState.SUBMITTING)
+    
+    assert session.current_state == WorkflowState.LISTENING
+    assert session.event_count == 1
+
+# Test resuming a session from a snapshot
+@pytest.mark.asyncio
+async def test_resume_session(workflow_controller):
+    result = await workflow_controller.create_session()
+    session = workflow_controller.sessions[result["session_id"]]
+    session.browser_session_id = "browser-1"
+    snapshot = session.snapshot()
+    
+    del workflow_controller.sessions[result["session_id"]]
+    resumed = workflow_controller.resume_session(snapshot)
+    
+    assert resumed["status"] == "resumed"
+    session = workflow_controller._get_active_session()
+    assert session.session_id == result["session_id"]
+    assert session.browser_session_id == "browser-1"
+    assert session.current_state == WorkflowState.LISTENING
+    assert session.event_count == 1
+
+# Test that every session event reaches the listeners
+@pytest.mark.asyncio
+async def test_listeners_receive_every_event(workflow_controller):
+    mock_listener = MagicMock()
+    workflow_controller.register_event_listener(mock_listener)
+    
+    await workflow_controller.process_voice_command("login to Slate")
+    
+    states = [call.args[0].state for call in mock_listener.call_args_list]
+    assert states == [
+        WorkflowState.LISTENING,
+        WorkflowState.PROCESSING_COMMAND,
+        WorkflowState.AUTHENTICATING,
+        WorkflowState.LISTENING,
+    ]
+
+# Test that the full last event is only included on request
+@pytest.mark.asyncio
+async def test_get_session_include_event(workflow_controller):
+    create_result = await workflow_controller.create_session()
+    session_id = create_result["session_id"]
+    
+    summary = workflow_controller.get_session(session_id)
+    assert "last_event" not in summary
+    assert summary["last_state"] == WorkflowState.LISTENING
+    assert summary["last_message"] == "Session created, listening for commands"
+    
+    detailed = workflow_controller.get_session(session_id, include_event=True)
+    assert detailed["last_event"]["state"] == WorkflowState.LISTENING
+
+# Test that events carry the id of the session they belong to
+@pytest.mark.asyncio
+async def test_events_carry_session_id(workflow_controller):
+    received = []
+    workflow_controller.register_event_listener(received.append)
+    
+    result = await workflow_controller.create_session()
+    
+    assert received[0].session_id == result["session_id"]
+    assert "session_id" not in received[0].to_dict()
+
+# Test that listeners registered for some states only see those states
+@pytest.mark.asyncio
+async def test_event_listener_states(workflow_controller):
+    idle_events = []
+    all_events = []
+    workflow_controller.register_event_listener(idle_events.append, states=[WorkflowState.IDLE])
+    workflow_controller.register_event_listener(all_events.append)
+    
+    result = await workflow_controller.create_session()
+    assert idle_events == []
+    
+    await workflow_controller.end_session(result["session_id"])
+    
+    assert [event.state for event in idle_events] == [WorkflowState.IDLE]
+    assert [event.state for event in all_events] == [WorkflowState.LISTENING, WorkflowState.IDLE]
+
+# Test that a listener registered during a notification only sees later events
+@pytest.mark.asyncio
+async def test_register_listener_during_notify(workflow_controller):
+    late_events = []
+    
+    def register_late(event):
+        workflow_controller.register_event_listener(late_events.append)
+    
+    workflow_controller.register_event_listener(register_late)
+    
+    result = await workflow_controller.create_session()
+    assert late_events == []
+    
+    await workflow_controller.end_session(result["session_id"])
+    assert [event.state for event in late_events] == [WorkflowState.IDLE]
+
+# Test that blocking listeners run off the event loop thread
+@pytest.mark.asyncio
+async def test_blocking_event_listener(workflow_controller):
+    import threading
+    
+    threads = []
+    workflow_controller.register_event_listener(
+        lambda event: threads.append(threading.get_ident()), blocking=True
+    )
+    
+    await workflow_controller.create_session()
+    await workflow_controller._event_queue.join()
+    
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+
+# Test that batch listeners get one call per buffered block
+@pytest.mark.asyncio
+async def test_batch_listener(workflow_controller):
+    batches = []
+    workflow_controller.register_batch_listener(batches.append)
+    
+    result = await workflow_controller.create_session()
+    assert [[event.state for event in batch] for batch in batches] == [[WorkflowState.LISTENING]]
+    
+    batches.clear()
+    await workflow_controller.process_voice_command("do a barrel roll")
+    
+    assert len(batches) == 1
+    assert [event.state for event in batches[0]] == [WorkflowState.PROCESSING_COMMAND, WorkflowState.ERROR]
+    assert all(event.session_id == result["session_id"] for event in batches[0])
+
+# Test that session ids are distinct and usable as UUIDs by the routes
+@pytest.mark.asyncio
+async def test_session_ids_are_uuid_hex(workflow_controller):
+    first = (await workflow_controller.create_session())["session_id"]
+    second = (await workflow_controller.create_session())["session_id"]
+    
+    assert first != second
+    assert uuid.UUID(first).hex == first
+    assert uuid.UUID(second).hex == second
+
+# Test that workers forked from one imported controller hand out different ids
+@pytest.mark.asyncio
+async def test_session_ids_differ_across_workers(monkeypatch):
+    monkeypatch.setattr(
+        'app.core.workflow_controller.initialize_voice_activator',
+        _stub_initialize_voice_activator
+    )
+    
+    # A fork copies the controller as it was when the app was imported
+    workers = [WorkflowController(), WorkflowController()]
+    workers[1]._session_id_prefix = workers[0]._session_id_prefix
+    
+    ids = []
+    for worker in workers:
+        await worker.initialize()
+        ids.append((await worker.create_session())["session_id"])
+        await worker.shutdown()
+    
+    assert ids[0] != ids[1]
+
+# Test that creating a session past the cap ends the least recently active one
+@pytest.mark.asyncio
+async def test_session_cap_evicts_least_recent(workflow_controller):
+    with patch('app.core.workflow_controller.MAX_SESSIONS', 2):
+        first = (await workflow_controller.create_session())["session_id"]
+        second = (await workflow_controller.create_session())["session_id"]
+        
+        # Activity on the first session makes the second the least recent
+        workflow_controller.sessions[first].add_event(WorkflowState.PROCESSING_COMMAND)
+        
+        third = (await workflow_controller.create_session())["session_id"]
+    
+    assert list(workflow_controller.sessions) == [first, third]
+    assert second not in workflow_controller.sessions
+
+# Test that cached session summaries are rebuilt once the session changes
+@pytest.mark.asyncio
+async def test_session_summary_cache(workflow_controller):
+    session_id = (await workflow_controller.create_session())["session_id"]
+    
+    summary = workflow_controller.get_session(session_id)
+    all_sessions = workflow_controller.get_all_sessions()
+    assert workflow_controller.get_session(session_id) is summary
+    assert workflow_controller.get_all_sessions() is all_sessions
+    
+    await workflow_controller.process_voice_command("do a barrel roll")
+    
+    assert workflow_controller.get_session(session_id)["current_state"] == WorkflowState.ERROR
+    assert workflow_controller.get_all_sessions()[0]["current_state"] == WorkflowState.ERROR
+    
+    second_id = (await workflow_controller.create_session())["session_id"]
+    assert [s["session_id"] for s in workflow_controller.get_all_sessions()] == [session_id, second_id]
+
+# Test that event timestamps come out as wall-clock datetimes
+def test_event_timestamp():
+    from datetime import datetime, timedelta
+    
+    session = WorkflowSession(session_id="test")
+    event = session.add_event(state=WorkflowState.LISTENING)
+    
+    assert abs(event.to_dict()["timestamp"] - datetime.now()) < timedelta(seconds=1)
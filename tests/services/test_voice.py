@@ -0,0 +1,40 @@
+# tests/services/test_voice.py
+import base64
+import binascii
+
+import pytest
+
+from app.services.voice import VoiceService, iter_base64_chunks
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+# Test decoding a stream split at arbitrary boundaries
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 3, 5, 4096])
+async def test_decode_audio_stream(chunk_size):
+    audio = bytes(range(256)) * 10
+    encoded = base64.b64encode(audio)
+    
+    decoded = b"".join([
+        frames async for frames in VoiceService().decode_audio_stream(_chunks(encoded, chunk_size))
+    ])
+    
+    assert decoded == audio
+
+# Test that invalid input is rejected
+@pytest.mark.asyncio
+async def test_decode_audio_stream_invalid():
+    with pytest.raises(binascii.Error):
+        async for _ in VoiceService().decode_audio_stream(iter_base64_chunks("!!notb64")):
+            pass
+
+# Test that an empty stream short-circuits to the shared negative result
+@pytest.mark.asyncio
+async def test_detect_wake_word_empty():
+    first = await VoiceService().detect_wake_word(iter_base64_chunks(""))
+    second = await VoiceService().detect_wake_word(iter_base64_chunks(""))
+    
+    assert not first.detected
+    assert first is second
@@ -0,0 +1,41 @@
+# tests/utils/test_audio_frontend.py
+import numpy as np
+
+from app.utils.audio_frontend import N_FFT, N_MELS, hann_window, mel_filterbank, mel_frontend
+
+# Test the filterbank shape and coverage
+def test_mel_filterbank_shape():
+    mel_fb = mel_filterbank()
+
+    assert mel_fb.shape == (N_FFT // 2 + 1, N_MELS)
+    assert mel_fb.dtype == np.float32
+    # Every filter has some weight
+    assert (mel_fb.sum(axis=0) > 0).all()
+
+# Test that a tone puts more energy in its mel band than silence
+def test_mel_frontend_tone():
+    mel_fb = mel_filterbank()
+    window = hann_window()
+
+    silence = np.zeros(N_FFT, dtype=np.int16)
+    t = np.arange(N_FFT) / 16000
+    tone = (10000 * np.sin(2 * np.pi * 1000 * t)).astype(np.int16)
+
+    silent_features = mel_frontend(silence, mel_fb, window)
+    tone_features = mel_frontend(tone, mel_fb, window)
+
+    assert silent_features.shape == (N_MELS,)
+    assert np.allclose(silent_features, np.log(1e-6))
+    assert tone_features.max() > silent_features.max()
+
+# Test that a batch of frames matches frame-by-frame results
+def test_mel_frontend_batch():
+    mel_fb = mel_filterbank()
+    window = hann_window()
+    frames = np.random.default_rng(0).integers(-3000, 3000, size=(4, N_FFT), dtype=np.int16)
+
+    batch = mel_frontend(frames, mel_fb, window)
+
+    assert batch.shape == (4, N_MELS)
+    for i in range(4):
+        assert np.allclose(batch[i], mel_frontend(frames[i], mel_fb, window), atol=1e-4)
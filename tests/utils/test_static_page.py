@@ -0,0 +1,88 @@
+# tests/utils/test_static_page.py
+from app.utils.static_page import StaticPage
+
+# Test loading a page and serving it from memory
+def test_static_page_from_file(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_bytes(b"<html></html>")
+
+    page = StaticPage.from_file(path)
+    path.unlink()
+    response = page.response()
+
+    assert response.body == b"<html></html>"
+    assert response.media_type == "text/html"
+
+# Test that a missing page is reported as None
+def test_static_page_missing(tmp_path):
+    assert StaticPage.from_file(tmp_path / "missing.html") is None
+
+# Test conditional requests against the page's ETag
+def test_static_page_etag():
+    page = StaticPage(b"<html></html>")
+
+    response = page.response(page.etag)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == page.etag
+
+    assert page.response(f'"stale", W/{page.etag}').status_code == 304
+    assert page.response('"stale"').status_code == 200
+    assert page.response().headers["cache-control"] == "public, max-age=60"
+
+# Test that gzip-capable clients get the precompressed body with its own ETag
+def test_static_page_gzip():
+    import gzip
+
+    page = StaticPage(b"<html>" + b"x" * 2000 + b"</html>")
+
+    response = page.response(accept_encoding="gzip, deflate")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == page.gzip_etag != page.etag
+    assert gzip.decompress(response.body) == page.body
+    assert page.response(page.gzip_etag, "gzip").status_code == 304
+    assert page.response(page.gzip_etag).status_code == 200
+
+# Test that only fingerprinted assets are marked immutable
+def test_caching_static_files(tmp_path):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.utils.static_page import CachingStaticFiles
+
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "lib-1.0.0.0123456789ab.min.css").write_text("body{}")
+    (tmp_path / "app.1a2b3c4d.js").write_text("")
+    (tmp_path / "app.js").write_text("")
+
+    app = FastAPI()
+    app.mount("/static", CachingStaticFiles(directory=tmp_path), name="static")
+    client = TestClient(app)
+
+    assert "immutable" in client.get("/static/vendor/lib-1.0.0.0123456789ab.min.css").headers["cache-control"]
+    assert "immutable" in client.get("/static/app.1a2b3c4d.js").headers["cache-control"]
+    assert "cache-control" not in client.get("/static/app.js").headers
+
+# Test that files missing from the static directory come from the fallback
+def test_caching_static_files_fallback(tmp_path):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.utils.static_page import CachingStaticFiles
+
+    built = tmp_path / "static"
+    source = tmp_path / "static_src"
+    built.mkdir()
+    source.mkdir()
+    (built / "index.html").write_text("built")
+    (source / "index.html").write_text("source")
+    (source / "app.js").write_text("source js")
+
+    app = FastAPI()
+    app.mount("/static", CachingStaticFiles(directory=built, fallback_directory=source), name="static")
+    client = TestClient(app)
+
+    assert client.get("/static/index.html").text == "built"
+    assert client.get("/static/app.js").text == "source js"
+    assert client.get("/static/missing.js").status_code == 404
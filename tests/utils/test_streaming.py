@@ -0,0 +1,16 @@
+# tests/utils/test_streaming.py
+import pytest
+
+from app.utils.streaming import iter_ndjson
+
+async def numbers(count):
+    for i in range(count):
+        yield i
+
+# Test NDJSON serialization, one item per line
+@pytest.mark.asyncio
+async def test_iter_ndjson():
+    chunks = [chunk async for chunk in iter_ndjson(numbers(3))]
+
+    assert b"".join(chunks) == b"0\n1\n2\n"
+    assert len(chunks) == 3
@@ -0,0 +1,125 @@
+# tests/utils/test_voice_activation.py
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.utils.voice_activation import PCMRingBuffer, VoiceActivator
+
+# Test that frames come back in order and in place
+@pytest.mark.asyncio
+async def test_ring_buffer_round_trip():
+    ring = PCMRingBuffer(slots=2, frame_samples=4, loop=asyncio.get_running_loop())
+
+    assert ring.put(np.arange(4, dtype=np.int16).tobytes())
+    assert ring.put(np.full(4, 7, dtype=np.int16).tobytes())
+    # Full: the next frame is dropped
+    assert not ring.put(np.zeros(4, dtype=np.int16).tobytes())
+
+    frame = await ring.get()
+    assert frame.tolist() == [0, 1, 2, 3]
+    ring.release()
+
+    assert (await ring.get()).tolist() == [7, 7, 7, 7]
+    ring.release()
+    assert ring.qsize() == 0
+
+# Test that closing wakes the consumer
+@pytest.mark.asyncio
+async def test_ring_buffer_close():
+    ring = PCMRingBuffer(slots=2, frame_samples=4, loop=asyncio.get_running_loop())
+
+    ring.close()
+
+    assert await ring.get() is None
+
+# Test that the listen task processes frames from a capture thread and stops cleanly
+@pytest.mark.asyncio
+async def test_listen_task_processes_frames():
+    activator = VoiceActivator()
+    activator._is_speech = lambda frame: True
+    seen = asyncio.Event()
+
+    async def process(frame):
+        seen.set()
+
+    activator.process_audio_data = process
+
+    await activator.start_listening()
+    frame = np.ones(1024, dtype=np.int16).tobytes()
+    threading.Thread(target=activator._audio_ring.put, args=(frame,)).start()
+    await asyncio.wait_for(seen.wait(), 1.0)
+
+    assert await activator.stop_listening() == {"status": "stopped"}
+    assert activator._listen_task is None
+
+# Test that model scores are thresholded into a detection
+def test_detect_wake_word_with_model():
+    class FakeModel:
+        def __init__(self, score):
+            self.score = score
+            self.shapes = []
+
+        def run(self, outputs, feeds):
+            self.shapes.append(feeds["input"].shape)
+            return [np.array([[self.score]], dtype=np.float32)]
+
+    activator = VoiceActivator()
+    activator._model_input = "input"
+    pcm = np.zeros(1024, dtype=np.int16)
+
+    activator._model = FakeModel(0.9)
+    assert activator._detect_wake_word(pcm)
+    # Two 512-sample windows of 40 mel bands
+    assert activator._model.shapes == [(1, 2, 40)]
+
+    activator._model = FakeModel(0.1)
+    assert not activator._detect_wake_word(pcm)
+
+# Test that the energy gate separates silence from a loud frame
+def test_is_speech_energy_gate():
+    activator = VoiceActivator()
+    activator._vad = None
+
+    silence = np.zeros(1024, dtype=np.int16)
+    t = np.arange(1024) / 16000
+    tone = (5000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+
+    assert not activator._is_speech(silence)
+    assert activator._is_speech(tone)
+
+# Test that a batch of frames is scored in a single model call
+@pytest.mark.asyncio
+async def test_process_audio_batch():
+    activator = VoiceActivator()
+    calls = []
+    activator._detect_wake_word = lambda pcm: calls.append(pcm.shape) or False
+
+    result = await activator.process_audio_batch(np.zeros((8, 1024), dtype=np.int16))
+
+    assert result == {"type": "none", "detected": False}
+    assert calls == [(8192,)]
+
+# Test that frames piling up in the ring are processed as one batch
+@pytest.mark.asyncio
+async def test_listen_task_batches_backlog():
+    activator = VoiceActivator()
+    activator._is_speech = lambda frame: True
+    batches = []
+    done = asyncio.Event()
+
+    async def process_batch(frames):
+        batches.append(frames.shape)
+        done.set()
+
+    activator.process_audio_batch = process_batch
+
+    await activator.start_listening()
+    for _ in range(3):
+        activator._audio_ring.put(np.ones(1024, dtype=np.int16).tobytes())
+    await asyncio.wait_for(done.wait(), 1.0)
+
+    assert batches == [(3, 1024)]
+    assert activator._audio_ring.qsize() == 0
+    await activator.stop_listening()